@@ -232,13 +232,14 @@ class ShellCommandExecutor:
         if base_cmd in {"jobs", "fg", "bg"}:
             return True
 
-        if base_cmd in Config.INTERACTIVE_COMMANDS:
+        if Config.command_flags(base_cmd) & Config.CMD_INTERACTIVE:
             return True
 
         if "|" in command:
             parts = command.split("|")
             for part in parts:
-                if part.strip().split()[0] in Config.INTERACTIVE_COMMANDS:
+                part_cmd = part.strip().split()[0]
+                if Config.command_flags(part_cmd) & Config.CMD_INTERACTIVE:
                     return True
 
         return False
@@ -1396,7 +1397,7 @@ class ShellCommandExecutor:
             base_cmd = parts[1]
 
         base_cmd = os.path.basename(base_cmd)
-        return base_cmd in getattr(Config, "STREAMING_COMMANDS", set())
+        return bool(Config.command_flags(base_cmd) & Config.CMD_STREAMING)
 
     def _handle_streaming_interactive_command(self, command: str) -> bool:
         if os.name == "nt":
@@ -1767,7 +1768,26 @@ class ShellCommandExecutor:
         base_cmd = command.strip().split()[0]
 
         if base_cmd in modify_commands:
-            self.completion_manager.update_cache()
+            self.completion_manager.update_cache(
+                affected_paths=self._modified_parent_dirs(command)
+            )
+
+    def _modified_parent_dirs(self, command: str) -> List[str]:
+        """Parent directories of the paths a file-modifying command names.
+
+        Covers targets given as absolute or ``../`` paths, which fall
+        outside the cwd that update_cache() invalidates by default.
+        """
+        try:
+            tokens = shlex.split(command)
+        except ValueError:
+            return []
+
+        return [
+            os.path.dirname(os.path.abspath(os.path.expanduser(token)))
+            for token in tokens[1:]
+            if token and not token.startswith("-")
+        ]
 
     def _execute_source_like_command(
         self, original_command: str, bash_command: str
@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
+import collections
+import functools
 import os
 import glob
 import stat
 import pwd
 import grp
+import re
+import select
 import shlex
+import shutil
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Set, Optional, Tuple
+from typing import Iterable, List, Dict, Set, Optional, Tuple
 from prompt_toolkit.completion import FuzzyWordCompleter, Completer, Completion
 from prompt_toolkit.document import Document
 import sys
@@ -15,23 +23,122 @@ import json
 from pathlib import Path
 from .config import Config
 
+_COMPLETION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=4, thread_name_prefix="simpl-completion"
+)
+
+
+@functools.lru_cache(maxsize=16)
+def _shell_available(name: str, path_env: str) -> bool:
+    # Keyed on PATH so completion managers rebuilt on config reload reuse the
+    # lookup; CompletionManager.clear_cache() forces a fresh check.
+    return shutil.which(name, path=path_env) is not None
+
+
+_TRAILING_TOKEN_RE = re.compile(r"\S*\Z")
+
+
+def _current_token_length(line: str, cursor_pos: int) -> int:
+    """Length of the whitespace-delimited token ending at the cursor."""
+    if cursor_pos > len(line):
+        cursor_pos = len(line)
+    return len(_TRAILING_TOKEN_RE.search(line, 0, cursor_pos).group())
+
+
+def _spawn(
+    cmd: List[str], timeout: float, env: Optional[Dict[str, str]] = None
+) -> Optional[bytes]:
+    """Run a one-shot completion command, returning raw stdout or None."""
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+        )
+    except OSError:
+        return None
+
+    try:
+        stdout, _ = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        return None
+
+    if proc.returncode != 0:
+        return None
+    return stdout
+
+
+class _FixedStartCompletions(list):
+    """Completion texts sharing one start position.
+
+    Holds plain strings and builds ``Completion`` objects only while being
+    iterated, so large result sets that the menu never fully renders are not
+    materialized up front. Indexing returns the raw text.
+    """
+
+    __slots__ = ("start_position",)
+
+    def __init__(self, texts, start_position: int):
+        super().__init__(texts)
+        self.start_position = start_position
+
+    def __iter__(self):
+        sp = self.start_position
+        for text in list.__iter__(self):
+            yield Completion(text, start_position=sp)
+
+
+@functools.lru_cache(maxsize=256)
+def _split_shell_words(text: str) -> Tuple[str, ...]:
+    lexer = shlex.shlex(text, posix=True)
+    lexer.whitespace_split = True
+    words = list(lexer)
+
+    if text[-1].isspace():
+        words.append("")
+
+    return tuple(words)
+
 
 class FileMetadata:
-    def __init__(self):
-        self._metadata_cache = {}
+    _METADATA_CACHE_SIZE = 4096
+    _MTIME_CACHE_SIZE = 1024
+    _SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+    def __init__(self, lock: Optional[threading.RLock] = None):
+        self._metadata_cache: "collections.OrderedDict[str, str]" = (
+            collections.OrderedDict()
+        )
+        self._mtime_fmt_cache: Dict[int, str] = {}
+        self._lock = lock if lock is not None else threading.RLock()
 
     def get_file_info(self, file_path: str) -> str:
-        if file_path in self._metadata_cache:
-            return self._metadata_cache[file_path]
+        cache = self._metadata_cache
+        cached = cache.get(file_path)
+        if cached is not None:
+            with self._lock:
+                if file_path in cache:
+                    cache.move_to_end(file_path)
+            return cached
 
         try:
-            stat_info = os.stat(file_path)
-
-            if os.path.isdir(file_path):
+            # One lstat covers the common case; only symlinks need a second
+            # stat to report on their target.
+            stat_info = os.lstat(file_path)
+            is_link = stat.S_ISLNK(stat_info.st_mode)
+            if is_link:
+                stat_info = os.stat(file_path)
+            mode = stat_info.st_mode
+
+            if stat.S_ISDIR(mode):
                 file_type = " Directory"
-            elif os.path.islink(file_path):
+            elif is_link:
                 file_type = " Symlink"
-            elif os.access(file_path, os.X_OK):
+            elif mode & 0o111:
                 file_type = " Executable"
             else:
                 _, ext = os.path.splitext(file_path)
@@ -49,19 +156,33 @@ class FileMetadata:
                 owner = str(stat_info.st_uid)
                 group = str(stat_info.st_gid)
 
-            mtime = datetime.fromtimestamp(stat_info.st_mtime)
-            mtime_str = mtime.strftime("%Y-%m-%d %H:%M")
+            mtime_str = self._format_mtime(stat_info.st_mtime)
 
             meta_info = (
                 f"{file_type} | {size_str} | {perms} | {owner}:{group} | {mtime_str}"
             )
 
-            self._metadata_cache[file_path] = meta_info
+            with self._lock:
+                cache[file_path] = meta_info
+                if len(cache) > self._METADATA_CACHE_SIZE:
+                    cache.popitem(last=False)
             return meta_info
 
         except (OSError, PermissionError, FileNotFoundError):
             return " Access denied or file not found"
 
+    def _format_mtime(self, mtime: float) -> str:
+        # Timestamps are shown to the minute, so entries modified within the
+        # same minute share one formatted string.
+        key = int(mtime) // 60
+        mtime_str = self._mtime_fmt_cache.get(key)
+        if mtime_str is None:
+            mtime_str = datetime.fromtimestamp(key * 60).strftime("%Y-%m-%d %H:%M")
+            if len(self._mtime_fmt_cache) >= self._MTIME_CACHE_SIZE:
+                self._mtime_fmt_cache.pop(next(iter(self._mtime_fmt_cache)))
+            self._mtime_fmt_cache[key] = mtime_str
+        return mtime_str
+
     def _get_file_type_by_extension(self, ext: str) -> str:
         type_map = {
             ".py": " Python",
@@ -109,24 +230,41 @@ class FileMetadata:
         return type_map.get(ext, " File")
 
     def _format_size(self, size_bytes: int) -> str:
-        if size_bytes == 0:
+        if size_bytes <= 0:
             return "0 B"
 
-        size_names = ["B", "KB", "MB", "GB", "TB"]
-        i = 0
-        size = float(size_bytes)
-
-        while size >= 1024.0 and i < len(size_names) - 1:
-            size /= 1024.0
-            i += 1
-
+        # Each unit is 2**10 of the previous one, so the unit index falls
+        # straight out of the bit length.
+        i = min((size_bytes.bit_length() - 1) // 10, len(self._SIZE_UNITS) - 1)
         if i == 0:
-            return f"{int(size)} {size_names[i]}"
-        else:
-            return f"{size:.1f} {size_names[i]}"
+            return f"{size_bytes} B"
+
+        size = size_bytes / (1 << (10 * i))
+        return f"{size:.1f} {self._SIZE_UNITS[i]}"
 
     def clear_cache(self):
-        self._metadata_cache.clear()
+        with self._lock:
+            self._metadata_cache.clear()
+
+    def invalidate_prefix(self, *paths: str):
+        """Drop cached entries for each of ``paths`` and anything beneath it.
+
+        PathScanner stores entries under normalised absolute paths, so each
+        directory is normalised once and keys are matched by plain prefix.
+        """
+        roots = set()
+        prefixes = []
+        for path in paths:
+            root = os.path.abspath(path)
+            roots.add(root)
+            prefixes.append(root if root.endswith(os.sep) else root + os.sep)
+        prefixes = tuple(prefixes)
+
+        with self._lock:
+            cache = self._metadata_cache
+            stale = [key for key in cache if key in roots or key.startswith(prefixes)]
+            for key in stale:
+                del cache[key]
 
 
 class PathScanner:
@@ -160,10 +298,15 @@ class PathScanner:
         "find",
     }
 
+    _CACHE_SIZE = 256
+
     def __init__(self):
-        self._cache = {}
+        self._cache: "collections.OrderedDict[str, Tuple]" = collections.OrderedDict()
         self._cache_time = {}
-        self.metadata = FileMetadata()
+        # Guards every mutation of the scan and metadata caches; lookups
+        # read a local reference without holding it.
+        self._lock = threading.RLock()
+        self.metadata = FileMetadata(lock=self._lock)
 
     def _get_cache_key(self, path: str) -> str:
         try:
@@ -183,19 +326,27 @@ class PathScanner:
             path = os.getcwd()
 
         cache_key = self._get_cache_key(path)
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        cache = self._cache
+        cached = cache.get(cache_key)
+        if cached is not None:
+            with self._lock:
+                if cache_key in cache:
+                    cache.move_to_end(cache_key)
+            return cached
 
         files = []
         directories = []
         meta_dict = {}
+        # Metadata is cached under normalised absolute paths so
+        # FileMetadata.invalidate_prefix can match entries by prefix.
+        base = os.path.abspath(path)
 
         try:
             for item in os.listdir(path):
                 if not include_hidden and item.startswith("."):
                     continue
 
-                item_path = os.path.join(path, item)
+                item_path = os.path.join(base, item)
 
                 meta_info = self.metadata.get_file_info(item_path)
                 meta_dict[item] = meta_info
@@ -213,7 +364,10 @@ class PathScanner:
             meta_dict,
         )
 
-        self._cache[cache_key] = result
+        with self._lock:
+            cache[cache_key] = result
+            if len(cache) > self._CACHE_SIZE:
+                cache.popitem(last=False)
         return result
 
     def get_completions_for_command(
@@ -234,8 +388,8 @@ class PathScanner:
 
 
 class CommandParser:
-    def __init__(self):
-        self.scanner = PathScanner()
+    def __init__(self, scanner: Optional[PathScanner] = None):
+        self.scanner = scanner if scanner is not None else PathScanner()
 
     def parse_input(self, text: str) -> Dict[str, any]:
         if not text.strip():
@@ -308,8 +462,8 @@ class CommandParser:
 
 class DynamicPathCompleter(Completer):
     def __init__(self):
-        self.parser = CommandParser()
         self.scanner = PathScanner()
+        self.parser = CommandParser(scanner=self.scanner)
 
         base_shell_commands = [
             "ls",
@@ -354,7 +508,12 @@ class DynamicPathCompleter(Completer):
             "which",
             "whereis",
         ]
-        self.shell_commands = self._load_all_commands(base_shell_commands)
+        self.shell_commands = sorted(base_shell_commands)
+        self.universal_completion_runner = None
+        self._ready = threading.Event()
+        self._lower_name_cache: Dict[
+            Tuple[str, bool], Tuple[Dict[str, List[str]], List[Tuple[str, str]]]
+        ] = {}
 
         self.command_meta = {
             "ls": " List directory contents",
@@ -425,12 +584,25 @@ class DynamicPathCompleter(Completer):
                         truncated_desc[k] = f"{default_icon} {desc_text}"
 
             self.command_meta.update(truncated_desc)
+            external_commands = set(external_desc.keys())
+        else:
+            external_commands = set()
 
-            new_commands = set(external_desc.keys())
-            current_commands = set(self.shell_commands)
-            self.shell_commands = sorted(list(current_commands.union(new_commands)))
+        # PATH scanning and shell runner probing are slow; do them off the
+        # prompt thread so the REPL appears immediately.
+        threading.Thread(
+            target=self._warm_up,
+            args=(base_shell_commands, external_commands),
+            daemon=True,
+        ).start()
 
-        self.universal_completion_runner = UniversalCompletionRunner()
+    def _warm_up(self, base_commands: List[str], external_commands: Set[str]) -> None:
+        try:
+            commands = set(self._load_all_commands(base_commands))
+            self.shell_commands = sorted(commands.union(external_commands))
+            self.universal_completion_runner = UniversalCompletionRunner()
+        finally:
+            self._ready.set()
 
     def get_completions(self, document: Document, complete_event):
         text = document.text_before_cursor
@@ -449,12 +621,15 @@ class DynamicPathCompleter(Completer):
             current_arg = context["current_arg"]
             target_dir = context["target_directory"]
 
-            shell_matches = self.universal_completion_runner.get_completions(
-                text, document.cursor_position
-            )
+            shell_matches = None
+            if self._ready.is_set() and self.universal_completion_runner:
+                shell_matches = self.universal_completion_runner.get_completions(
+                    text,
+                    document.cursor_position,
+                    complete_event.completion_requested,
+                )
             if shell_matches:
-                for match in shell_matches:
-                    yield match
+                yield from shell_matches
                 return
 
             candidates, meta_dict = self.scanner.get_completions_for_command(
@@ -468,16 +643,35 @@ class DynamicPathCompleter(Completer):
 
                     filtered_candidates = []
                     filtered_meta = {}
+                    all_prefix_matches = True
+                    file_part_lower = file_part.lower()
+                    lowered_candidates = self._get_lowered_candidates(
+                        command, target_dir, candidates
+                    )
 
-                    for candidate in candidates:
-                        if candidate.lower().startswith(
-                            file_part.lower()
-                        ) or self._fuzzy_match(candidate, file_part):
+                    for candidate, candidate_lower in lowered_candidates:
+                        if candidate_lower.startswith(file_part_lower):
+                            matched = True
+                        elif self._fuzzy_match_lower(candidate_lower, file_part_lower):
+                            matched = True
+                            all_prefix_matches = False
+                        else:
+                            matched = False
+
+                        if matched:
                             filtered_candidates.append(candidate)
                             if candidate in meta_dict:
                                 filtered_meta[candidate] = meta_dict[candidate]
 
-                    if filtered_candidates:
+                    if filtered_candidates and file_part and all_prefix_matches:
+                        start_offset = -len(file_part)
+                        for candidate in filtered_candidates:
+                            yield Completion(
+                                text=candidate,
+                                start_position=start_offset,
+                                display_meta=filtered_meta.get(candidate, ""),
+                            )
+                    elif filtered_candidates:
                         fuzzy_completer = FuzzyWordCompleter(
                             words=filtered_candidates, meta_dict=filtered_meta
                         )
@@ -495,6 +689,41 @@ class DynamicPathCompleter(Completer):
                                 display_meta=completion.display_meta,
                             )
                 else:
+                    if not current_arg:
+                        max_candidates = Config.COMPLETION_MAX_CANDIDATES
+                        if max_candidates and len(candidates) > max_candidates:
+                            # Directories are what bare Tab usually heads
+                            # into, so they fill the capped list first.
+                            directories = set(
+                                self.scanner.scan_directory(target_dir)[0][
+                                    "directories"
+                                ]
+                            )
+                            shown = [c for c in candidates if c in directories]
+                            shown += [c for c in candidates if c not in directories]
+                            for candidate in shown[:max_candidates]:
+                                yield Completion(
+                                    candidate,
+                                    display_meta=meta_dict.get(candidate, ""),
+                                )
+                            # A trailing entry that inserts nothing carries
+                            # the hint, leaving every real entry's meta as is.
+                            hint = f"… {len(candidates)} entries, type to filter"
+                            yield Completion("", display=hint)
+                            return
+                    else:
+                        arg_lower = current_arg.lower()
+                        lowered_candidates = self._get_lowered_candidates(
+                            command, target_dir, candidates
+                        )
+                        prefix_matches = [
+                            candidate
+                            for candidate, candidate_lower in lowered_candidates
+                            if candidate_lower.startswith(arg_lower)
+                        ]
+                        if prefix_matches:
+                            candidates = prefix_matches
+
                     fuzzy_completer = FuzzyWordCompleter(
                         words=candidates, meta_dict=meta_dict
                     )
@@ -506,12 +735,30 @@ class DynamicPathCompleter(Completer):
                     ):
                         yield completion
 
+    def _get_lowered_candidates(
+        self, command: str, target_dir: str, candidates: List[str]
+    ) -> List[Tuple[str, str]]:
+        # Tied to the scanner's cached listing object: a rescan or an
+        # invalidation produces a new listing and so a fresh lowered copy,
+        # even when the number of entries is unchanged.
+        listing = self.scanner.scan_directory(target_dir)[0]
+        cache_key = (target_dir, command in PathScanner.DIR_COMMANDS)
+        cached = self._lower_name_cache.get(cache_key)
+        if cached is not None and cached[0] is listing:
+            return cached[1]
+
+        lowered = [(candidate, candidate.lower()) for candidate in candidates]
+        if len(self._lower_name_cache) >= 32:
+            self._lower_name_cache.clear()
+        self._lower_name_cache[cache_key] = (listing, lowered)
+        return lowered
+
     def _fuzzy_match(self, candidate: str, query: str) -> bool:
-        if not query:
-            return True
+        return self._fuzzy_match_lower(candidate.lower(), query.lower())
 
-        candidate_lower = candidate.lower()
-        query_lower = query.lower()
+    def _fuzzy_match_lower(self, candidate_lower: str, query_lower: str) -> bool:
+        if not query_lower:
+            return True
 
         candidate_idx = 0
         for char in query_lower:
@@ -547,6 +794,129 @@ class DynamicPathCompleter(Completer):
         return sorted(commands)
 
 
+class PersistentShell:
+    """Long-lived shell child that answers scripts written to its stdin.
+
+    Every request is followed by a command printing a sentinel line, and the
+    reply is everything read before it. The child is killed on timeout or
+    EOF and respawned, re-running the preamble, on the next request.
+    """
+
+    SENTINEL = "__SIMPL_CLI_EOF__"
+
+    def __init__(
+        self,
+        argv: List[str],
+        preamble=None,
+        preamble_timeout: float = 1.5,
+        sentinel_command: str = "printf '%s\\n' {sentinel}",
+    ) -> None:
+        self.argv = list(argv)
+        self._preamble = preamble
+        self._preamble_timeout = preamble_timeout
+        self._sentinel_command = sentinel_command.format(sentinel=self.SENTINEL)
+        self._lock = threading.Lock()
+        self._proc: Optional[subprocess.Popen] = None
+        # Set once the preamble's sentinel has been read back.
+        self._ready = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        """True while the child is running with its preamble completed."""
+        proc = self._proc
+        return self._ready.is_set() and proc is not None and proc.poll() is None
+
+    def start(self) -> bool:
+        """Spawn the child and run its preamble now unless already running."""
+        with self._lock:
+            proc = self._proc
+            if proc is None or proc.poll() is not None:
+                proc = self._spawn()
+            return proc is not None
+
+    def request(self, script: str, timeout: float) -> Optional[str]:
+        with self._lock:
+            proc = self._proc
+            if proc is None or proc.poll() is not None:
+                proc = self._spawn()
+                if proc is None:
+                    return None
+
+            output = self._exchange(proc, script, timeout)
+            if output is None:
+                self._kill()
+            return output
+
+    def close(self) -> None:
+        with self._lock:
+            self._kill()
+
+    def _spawn(self) -> Optional[subprocess.Popen]:
+        try:
+            proc = subprocess.Popen(
+                self.argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                bufsize=0,
+            )
+        except OSError:
+            return None
+
+        self._proc = proc
+        preamble = self._preamble() if callable(self._preamble) else self._preamble
+        if preamble:
+            if self._exchange(proc, preamble, self._preamble_timeout) is None:
+                self._kill()
+                return None
+        self._ready.set()
+        return proc
+
+    def _kill(self) -> None:
+        self._ready.clear()
+        proc = self._proc
+        self._proc = None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=1.0)
+        except Exception:
+            pass
+
+    def _exchange(
+        self, proc: subprocess.Popen, script: str, timeout: float
+    ) -> Optional[str]:
+        marker = f"{self.SENTINEL}\n".encode()
+        payload = f"{script}\n{self._sentinel_command}\n"
+        try:
+            proc.stdin.write(payload.encode("utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        fd = proc.stdout.fileno()
+        buffer = bytearray()
+        deadline = time.monotonic() + timeout
+        while True:
+            index = buffer.find(marker)
+            if index != -1 and (index == 0 or buffer[index - 1] == 0x0A):
+                return buffer[:index].decode("utf-8", "replace")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                ready, _, _ = select.select([fd], [], [], remaining)
+                if not ready:
+                    return None
+                chunk = os.read(fd, 65536)
+            except (OSError, ValueError):
+                return None
+            if not chunk:
+                return None
+            buffer += chunk
+
+
 class BashCompletionRunner:
     _OPTIONS_WITH_VALUES = {
         "-o",
@@ -567,6 +937,8 @@ class BashCompletionRunner:
         "-U",
     }
 
+    _BULK_SOURCE_TIMEOUT = 10.0
+
     def __init__(self) -> None:
         self.shell_name = "bash"
         self.enabled = True
@@ -574,28 +946,40 @@ class BashCompletionRunner:
             path for path in Config.BASH_COMPLETION_FILES if os.path.exists(path)
         ]
         self.completion_dirs = [
-            path for path in Config.BASH_COMPLETION_DIRS if os.path.isdir(path)
+            str(path) for path in Config.bash_completion_dirs() if path.is_dir()
         ]
         self._completion_map: Optional[Dict[str, Dict[str, str]]] = None
         self._attempted_commands: Set[str] = set()
+        self._map_lock = threading.Lock()
+        self._sourced_paths: Set[str] = set()
+        self._shell = PersistentShell(
+            ["bash", "--noprofile", "--norc"],
+            preamble=self._build_preamble,
+            preamble_timeout=self._BULK_SOURCE_TIMEOUT,
+        )
+        # Set once the preamble has run and the completion map is built.
+        self._ready = threading.Event()
+        self._warm_up_lock = threading.Lock()
+        self._warm_up_thread: Optional[threading.Thread] = None
+
+        if self.available_scripts:
+            self._start_warm_up()
     
     def is_available(self) -> bool:
         """Check if bash is available on the system."""
-        try:
-            result = subprocess.run(
-                ["which", "bash"],
-                capture_output=True,
-                text=True,
-                timeout=1.0,
-            )
-            return result.returncode == 0
-        except Exception:
-            return True  # Assume bash is available
+        return _shell_available("bash", os.environ.get("PATH", ""))
 
     def get_completions(self, line: str, cursor_pos: int):
         if not self.available_scripts:
             return []
 
+        # Bulk-sourcing every completion file can take seconds; until that
+        # has finished in the background, answer with nothing rather than
+        # blocking the prompt behind it.
+        if not (self._ready.is_set() and self._shell.ready):
+            self._start_warm_up()
+            return []
+
         command_name = self._extract_command_name(line)
         if not command_name:
             return []
@@ -613,49 +997,51 @@ class BashCompletionRunner:
         source_path = comp_entry.get("source")
 
         try:
-            cmd = self._build_command(
+            script = self._build_command(
                 line, cursor_pos, command_name, run_script, source_path
             )
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=1.0,
-            )
-            if result.returncode != 0:
+            output = self._shell.request(script, timeout=1.0)
+            if output is None:
                 return []
 
-            token_length = self._current_token_length(line, cursor_pos)
-            completions = []
-            for item in result.stdout.splitlines():
-                item = item.strip()
-                if item:
-                    completions.append(Completion(item, start_position=-token_length))
-            return completions
+            sp = -self._current_token_length(line, cursor_pos)
+            return _FixedStartCompletions(
+                [s for s in map(str.strip, output.splitlines()) if s], sp
+            )
         except Exception:
             return []
 
+    def _start_warm_up(self) -> None:
+        with self._warm_up_lock:
+            thread = self._warm_up_thread
+            if thread is not None and thread.is_alive():
+                return
+            thread = threading.Thread(target=self._warm_up, daemon=True)
+            self._warm_up_thread = thread
+            thread.start()
+
+    def _warm_up(self) -> None:
+        if self._shell.start():
+            self._ensure_completion_map()
+            self._ready.set()
+
     def _ensure_completion_map(self) -> None:
-        if self._completion_map is not None:
-            return
+        with self._map_lock:
+            if self._completion_map is not None:
+                return
+            self._load_completion_map()
 
+    def _load_completion_map(self) -> None:
         self._completion_map = {}
-        script_sources = self._build_source_prefix()
-        if not script_sources:
+        if not self.available_scripts:
             return
 
-        command = ["bash", "-lc", f"{script_sources} complete -p"]
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=1.5,
-            )
-            if result.returncode != 0:
+            output = self._shell.request("complete -p", timeout=1.5)
+            if output is None:
                 return
 
-            self._parse_complete_output(result.stdout)
+            self._parse_complete_output(output)
         except Exception:
             self._completion_map = {}
 
@@ -674,25 +1060,16 @@ class BashCompletionRunner:
         if not script_path:
             return
 
-        script_sources = (
-            f"{self._build_source_prefix()}source {shlex.quote(script_path)};"
-        )
-        command = [
-            "bash",
-            "-lc",
-            f"{script_sources} complete -p {shlex.quote(command_name)}",
-        ]
         try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
+            output = self._shell.request(
+                f"{self._build_source_command(script_path)}"
+                f"complete -p {shlex.quote(command_name)}",
                 timeout=1.5,
             )
-            if result.returncode != 0:
+            if output is None:
                 return
 
-            self._parse_complete_output(result.stdout, source_hint=script_path)
+            self._parse_complete_output(output, source_hint=script_path)
         except Exception:
             return
 
@@ -767,10 +1144,10 @@ class BashCompletionRunner:
         command_name: str,
         function_name: str,
         source_path: Optional[str],
-    ) -> List[str]:
-        script_sources = self._build_source_prefix()
+    ) -> str:
+        script_sources = f"cd -- {shlex.quote(os.getcwd())} 2>/dev/null;"
         if source_path:
-            script_sources += f"source {shlex.quote(source_path)};"
+            script_sources += self._build_source_command(source_path)
 
         line_before_cursor = line[:cursor_pos]
         words = self._split_words(line_before_cursor)
@@ -787,10 +1164,10 @@ class BashCompletionRunner:
             f"COMP_WORDS=({comp_words});"
             f"COMP_CWORD={comp_cword};"
             "COMPREPLY=();"
-            f"{function_name} {shlex.quote(command_name)} >/dev/null;"
+            f"{function_name} {shlex.quote(command_name)} </dev/null >/dev/null;"
             "printf '%s\\n' \"${COMPREPLY[@]}\""
         )
-        return ["bash", "-lc", script_body]
+        return script_body
 
     def _current_token_length(self, line: str, cursor_pos: int) -> int:
         prefix = line[:cursor_pos]
@@ -803,6 +1180,30 @@ class BashCompletionRunner:
             [f"source {shlex.quote(path)};" for path in self.available_scripts]
         )
 
+    def _build_source_command(self, path: str) -> str:
+        # The coprocess keeps sourced functions, so each file only needs to be
+        # sourced once per bash process.
+        if path in self._sourced_paths:
+            return ""
+        self._sourced_paths.add(path)
+        return f"source {shlex.quote(path)} </dev/null >/dev/null 2>&1;"
+
+    def _build_preamble(self) -> str:
+        # Runs once per bash process, so anything sourced before is gone.
+        self._sourced_paths = set()
+        return self._build_source_prefix() + self._build_bulk_source_commands()
+
+    def _build_bulk_source_commands(self) -> str:
+        # Source every per-command completion file up front so a single
+        # 'complete -p' captures them all and Tab presses never have to
+        # locate and load scripts lazily.
+        commands = []
+        for directory in self.completion_dirs:
+            for path in sorted(glob.glob(os.path.join(directory, "*"))):
+                if os.path.isfile(path):
+                    commands.append(self._build_source_command(path))
+        return "".join(commands)
+
     def _extract_command_name(self, line: str) -> Optional[str]:
         stripped = line.lstrip()
         if not stripped:
@@ -812,15 +1213,7 @@ class BashCompletionRunner:
     def _split_words(self, text: str) -> List[str]:
         if not text:
             return []
-
-        lexer = shlex.shlex(text, posix=True)
-        lexer.whitespace_split = True
-        words = list(lexer)
-
-        if text and text[-1].isspace():
-            words.append("")
-
-        return words
+        return list(_split_shell_words(text))
 
 
 class ShellCompletionRunner:
@@ -832,32 +1225,25 @@ class ShellCompletionRunner:
     
     def is_available(self) -> bool:
         """Check if this shell is available on the system."""
-        try:
-            result = subprocess.run(
-                ["which", self.shell_name],
-                capture_output=True,
-                text=True,
-                timeout=1.0,
-            )
-            return result.returncode == 0
-        except Exception:
-            return False
+        return _shell_available(self.shell_name, os.environ.get("PATH", ""))
     
     def get_completions(self, line: str, cursor_pos: int):
         """Get completions from this shell."""
         raise NotImplementedError
 
+    def _current_token_length(self, line: str, cursor_pos: int) -> int:
+        """Calculate length of current token for cursor positioning."""
+        return _current_token_length(line, cursor_pos)
+
 
 class FishCompletionRunner(ShellCompletionRunner):
     """Fish shell completion runner."""
     
     def __init__(self):
         super().__init__("fish")
-        self.completion_dirs = []
-        for dir_path in Config.FISH_COMPLETION_DIRS:
-            expanded = os.path.expanduser(dir_path)
-            if os.path.isdir(expanded):
-                self.completion_dirs.append(expanded)
+        self.completion_dirs = [
+            str(path) for path in Config.fish_completion_dirs() if path.is_dir()
+        ]
     
     def get_completions(self, line: str, cursor_pos: int):
         if not self.is_available() or not self.enabled:
@@ -866,18 +1252,12 @@ class FishCompletionRunner(ShellCompletionRunner):
         try:
             # Fish completion command: complete -C "command line"
             cmd = ["fish", "-c", f'complete -C "{line}"']
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=1.0,
-            )
-            
-            if result.returncode != 0:
+            stdout = _spawn(cmd, timeout=1.0)
+            if stdout is None:
                 return []
             
             completions = []
-            for item in result.stdout.splitlines():
+            for item in stdout.decode("utf-8", "replace").splitlines():
                 item = item.strip()
                 if not item:
                     continue
@@ -900,84 +1280,86 @@ class FishCompletionRunner(ShellCompletionRunner):
             return completions
         except Exception:
             return []
-    
-    def _current_token_length(self, line: str, cursor_pos: int) -> int:
-        """Calculate length of current token for cursor positioning."""
-        if cursor_pos > len(line):
-            cursor_pos = len(line)
-        
-        # Find start of current token
-        start = cursor_pos - 1
-        while start >= 0 and not line[start].isspace():
-            start -= 1
-        
-        return cursor_pos - (start + 1)
 
 
 class ZshCompletionRunner(ShellCompletionRunner):
     """Zsh shell completion runner."""
+
+    # Loaded once into the persistent zsh process; compinit is the slow part.
+    _PREAMBLE = """
+autoload -Uz compinit
+compinit -i 2>/dev/null
+"""
+
+    _COMPLETE_FUNCTION = """
+__simpl_complete() {
+    local -a words matches
+    words=(${=1})
+    compadd -O matches - "${words[@]}" 2>/dev/null
+    (( ${#matches} )) && print -rl -- "${matches[@]}"
+}
+"""
+
+    # Written once under Config.CACHE_DIR and zcompiled; `source` picks up
+    # the newer .zwc bytecode.
+    _SCRIPT_NAME = "complete.zsh"
     
     def __init__(self):
         super().__init__("zsh")
-        self.completion_dirs = []
-        for dir_path in Config.ZSH_COMPLETION_DIRS:
-            expanded = os.path.expanduser(dir_path)
-            if os.path.isdir(expanded):
-                self.completion_dirs.append(expanded)
+        self.completion_dirs = [
+            str(path) for path in Config.zsh_completion_dirs() if path.is_dir()
+        ]
+        self._shell = PersistentShell(
+            ["zsh", "-f"], preamble=self._build_preamble, preamble_timeout=5.0
+        )
+
+    def _build_preamble(self) -> str:
+        path = self._ensure_script()
+        if path is None:
+            return self._PREAMBLE + self._COMPLETE_FUNCTION
+
+        quoted = shlex.quote(str(path))
+        return (
+            self._PREAMBLE
+            + f"[[ {quoted}.zwc -nt {quoted} ]] || zcompile {quoted} 2>/dev/null\n"
+            + f"source {quoted}\n"
+        )
+
+    def _ensure_script(self) -> Optional[Path]:
+        """Return the cached script path, or None to source it inline."""
+        path = Config.CACHE_DIR / self._SCRIPT_NAME
+        try:
+            if path.read_text() == self._COMPLETE_FUNCTION:
+                return path
+        except OSError:
+            pass
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(self._COMPLETE_FUNCTION)
+        except OSError:
+            return None
+        return path
     
     def get_completions(self, line: str, cursor_pos: int):
         if not self.is_available() or not self.enabled:
             return []
         
         try:
-            # Simple zsh completion using zsh's built-in completion
-            # Escape the line for zsh
-            escaped_line = line.replace('"', '\\"')
-            zsh_script = f'''
-                # Load completion system
-                autoload -Uz compinit
-                compinit -i 2>/dev/null
-                
-                # Use zsh's completion
-                words=($(echo "{escaped_line}"))
-                compadd -O tmpfile - "${{words[@]}}"
-                cat tmpfile 2>/dev/null
-                rm -f tmpfile 2>/dev/null
-            '''
-            
-            cmd = ["zsh", "-c", zsh_script]
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
+            output = self._shell.request(
+                f"cd -- {shlex.quote(os.getcwd())} 2>/dev/null;"
+                f"__simpl_complete {shlex.quote(line)}",
                 timeout=1.0,
             )
-            
-            if result.returncode != 0:
+            if output is None:
                 return []
             
-            token_length = self._current_token_length(line, cursor_pos)
-            completions = []
-            for item in result.stdout.splitlines():
-                item = item.strip()
-                if item:
-                    completions.append(Completion(item, start_position=-token_length))
-            
-            return completions
+            sp = -self._current_token_length(line, cursor_pos)
+            return _FixedStartCompletions(
+                [s for s in map(str.strip, output.splitlines()) if s], sp
+            )
         except Exception:
             return []
-    
-    def _current_token_length(self, line: str, cursor_pos: int) -> int:
-        """Calculate length of current token for cursor positioning."""
-        if cursor_pos > len(line):
-            cursor_pos = len(line)
-        
-        # Find start of current token
-        start = cursor_pos - 1
-        while start >= 0 and not line[start].isspace():
-            start -= 1
-        
-        return cursor_pos - (start + 1)
 
 
 class NushellCompletionRunner(ShellCompletionRunner):
@@ -991,46 +1373,44 @@ class NushellCompletionRunner(ShellCompletionRunner):
             return []
         
         try:
-            # Nushell completion
-            cmd = ["nu", "-c", f'complete "{line}"']
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=1.0,
+            # Nushell completion; the line travels through the environment so
+            # quotes, `$` and backticks never reach nushell's parser.
+            cmd = ["nu", "-c", "complete $env.SIMPL_CLI_LINE"]
+            stdout = _spawn(
+                cmd, timeout=1.0, env={**os.environ, "SIMPL_CLI_LINE": line}
             )
-            
-            if result.returncode != 0:
+            if stdout is None:
                 return []
             
-            token_length = self._current_token_length(line, cursor_pos)
-            completions = []
-            for item in result.stdout.splitlines():
-                item = item.strip()
-                if item:
-                    completions.append(Completion(item, start_position=-token_length))
-            
-            return completions
+            sp = -self._current_token_length(line, cursor_pos)
+            lines = stdout.decode("utf-8", "replace").splitlines()
+            return _FixedStartCompletions([s for s in map(str.strip, lines) if s], sp)
         except Exception:
             return []
-    
-    def _current_token_length(self, line: str, cursor_pos: int) -> int:
-        """Calculate length of current token for cursor positioning."""
-        if cursor_pos > len(line):
-            cursor_pos = len(line)
-        
-        # Find start of current token
-        start = cursor_pos - 1
-        while start >= 0 and not line[start].isspace():
-            start -= 1
-        
-        return cursor_pos - (start + 1)
 
 
 class UniversalCompletionRunner:
     """Universal completion runner that tries multiple shells."""
+
+    _CACHE_SIZE = 128
+    _CACHE_TTL = 1.0
+    _NEGATIVE_CACHE_SIZE = 256
     
     def __init__(self):
+        self._cache: "collections.OrderedDict[tuple, Tuple[float, list]]" = (
+            collections.OrderedDict()
+        )
+        # Lines that produced no completions, kept apart so gibberish typed
+        # mid-word does not evict useful results.
+        self._neg: "collections.OrderedDict[tuple, float]" = collections.OrderedDict()
+        self._generation = 0
+        # Single-slot fast path for cursor-only redraws of the same line.
+        self._last_key: Optional[Tuple[str, int, str]] = None
+        self._last_result: list = []
+        self._last_expiry = 0.0
+        # (text before the word, word, cwd, generation, completions) of the
+        # last shell round-trip, reused while the user keeps extending the word.
+        self._prefix: Optional[Tuple[str, str, str, int, list]] = None
         self.runners = {
             "fish": FishCompletionRunner(),
             "zsh": ZshCompletionRunner(),
@@ -1049,29 +1429,181 @@ class UniversalCompletionRunner:
             self.enabled_shells = ["fish", "zsh", "bash", "nushell"]
         
         # Disable runners for shells that are not available
-        for shell_name, runner in self.runners.items():
-            if hasattr(runner, 'is_available'):
-                if not runner.is_available():
-                    runner.enabled = False
+        for runner in self.runners.values():
+            if not runner.is_available():
+                runner.enabled = False
+
+        # Resolve priority order once so dispatch is a plain list walk.
+        self._ordered = [
+            self.runners[shell]
+            for shell in self.enabled_shells
+            if shell in self.runners and self.runners[shell].enabled
+        ]
     
-    def get_completions(self, line: str, cursor_pos: int):
-        """Get completions from enabled shells in order."""
+    def get_completions(
+        self, line: str, cursor_pos: int, completion_requested: bool = True
+    ):
+        """Get completions from enabled shells in order.
+
+        ``completion_requested`` is False for complete-while-typing events,
+        which skip the shell round-trip for very short words.
+        """
         if not line.strip():
             return []
-        
-        # Try each enabled shell in order
-        for shell_name in self.enabled_shells:
-            if shell_name in self.runners:
-                runner = self.runners[shell_name]
-                # Check if runner is enabled (has attribute and is True)
-                if hasattr(runner, 'enabled') and not runner.enabled:
-                    continue
-                completions = runner.get_completions(line, cursor_pos)
-                if completions:
-                    return completions
-        
+
+        now = time.monotonic()
+        # The same text completes differently in another directory.
+        last_key = (line, cursor_pos, os.getcwd())
+        if last_key == self._last_key and now < self._last_expiry:
+            return self._last_result
+
+        completions = self._filter_previous(line, cursor_pos)
+        if not completions:
+            # A word of one or two letters matches most of the shell's
+            # candidate space; while typing, wait for more input rather than
+            # spawning for it. An explicit Tab always asks the shells.
+            if (
+                not completion_requested
+                and _current_token_length(line, cursor_pos)
+                < Config.COMPLETION_MIN_TOKEN_LEN
+                and not line[:cursor_pos].endswith((" ", "/", "-"))
+            ):
+                return []
+            completions = self._lookup(line, cursor_pos, now)
+        self._last_key = last_key
+        self._last_result = completions
+        self._last_expiry = now + self._CACHE_TTL
+        return completions
+
+    def _filter_previous(self, line: str, cursor_pos: int):
+        """Narrow the last shell result when the current word only grew."""
+        if self._prefix is None:
+            return []
+
+        head_prev, token_prev, cwd, generation, previous = self._prefix
+        before = line[:cursor_pos]
+        token_length = _current_token_length(line, cursor_pos)
+        token = before[len(before) - token_length :]
+        head = before[: len(before) - token_length]
+        if (
+            head != head_prev
+            or len(token) <= len(token_prev)
+            or not token.startswith(token_prev)
+            or generation != self._generation
+            or cwd != os.getcwd()
+        ):
+            return []
+
+        # Crossing into a directory or an option value changes the candidate
+        # set itself, so those need a fresh round-trip.
+        extension = token[len(token_prev) :]
+        if "/" in extension or "=" in extension or ":" in extension:
+            return []
+
+        if isinstance(previous, _FixedStartCompletions):
+            return _FixedStartCompletions(
+                [t for t in list.__iter__(previous) if t.startswith(token)],
+                -token_length,
+            )
+        return [
+            Completion(
+                c.text,
+                start_position=-token_length,
+                display=c.display,
+                display_meta=c.display_meta,
+            )
+            for c in previous
+            if c.text.startswith(token)
+        ]
+
+    def _lookup(self, line: str, cursor_pos: int, now: float):
+        # Redraws and repeated Tab presses ask for the same line again; serve
+        # those from a short-lived cache instead of re-running the shells.
+        key = (line, cursor_pos, os.getcwd(), self._generation)
+        cached = self._cache.get(key)
+        if cached is not None:
+            timestamp, completions = cached
+            if now - timestamp < self._CACHE_TTL:
+                self._cache.move_to_end(key)
+                return completions
+            del self._cache[key]
+
+        expiry = self._neg.get(key)
+        if expiry is not None:
+            if now < expiry:
+                return []
+            del self._neg[key]
+
+        completions = self._run_shells(line, cursor_pos)
+        if not completions:
+            self._neg[key] = time.monotonic() + self._CACHE_TTL
+            if len(self._neg) > self._NEGATIVE_CACHE_SIZE:
+                self._neg.popitem(last=False)
+            return []
+
+        self._cache[key] = (time.monotonic(), completions)
+        if len(self._cache) > self._CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+        before = line[:cursor_pos]
+        token_length = _current_token_length(line, cursor_pos)
+        self._prefix = (
+            before[: len(before) - token_length],
+            before[len(before) - token_length :],
+            key[2],
+            self._generation,
+            completions,
+        )
+        return completions
+
+    def invalidate(self) -> None:
+        """Drop cached shell completions (e.g. after a directory change)."""
+        self._generation += 1
+        self._last_key = None
+        self._prefix = None
+        self._cache.clear()
+        self._neg.clear()
+
+    def _run_shells(self, line: str, cursor_pos: int):
+        runners = self._ordered
+        if not runners:
+            return []
+
+        if len(runners) == 1:
+            return runners[0].get_completions(line, cursor_pos)
+
+        # Set once a higher-priority runner answers. Runners still queued
+        # behind the pool check it and skip spawning a shell, since cancel()
+        # cannot stop futures that have already started.
+        answered = threading.Event()
+
+        # The runners are independent subprocess round-trips, so run them
+        # concurrently and take the first non-empty result in priority order.
+        futures = [
+            _COMPLETION_EXECUTOR.submit(
+                self._run_runner, runner, line, cursor_pos, answered
+            )
+            for runner in runners
+        ]
+        for index, future in enumerate(futures):
+            try:
+                completions = future.result()
+            except Exception:
+                continue
+            if completions:
+                answered.set()
+                for pending in futures[index + 1 :]:
+                    pending.cancel()
+                return completions
+
         return []
 
+    @staticmethod
+    def _run_runner(runner, line: str, cursor_pos: int, answered: threading.Event):
+        if answered.is_set():
+            return []
+        return runner.get_completions(line, cursor_pos)
+
 
 class CompletionManager:
     def __init__(self):
@@ -1080,23 +1612,39 @@ class CompletionManager:
     def get_completer(self):
         return self.path_completer
 
-    def update_cache(self, path: str = None):
+    def update_cache(self, path: str = None, affected_paths: Iterable[str] = ()):
+        """Forget cached listings for ``path`` (the cwd by default).
+
+        ``affected_paths`` are further directories whose entries changed,
+        e.g. the parents of a ``cp``/``mv`` destination outside the cwd.
+        """
         if path is None:
             path = os.getcwd()
 
-        cache_key = self.path_completer.scanner._get_cache_key(path)
-        if cache_key in self.path_completer.scanner._cache:
-            del self.path_completer.scanner._cache[cache_key]
-
-        self.path_completer.scanner.metadata.clear_cache()
+        scanner = self.path_completer.scanner
+        cache_key = scanner._get_cache_key(path)
+        with scanner._lock:
+            scanner._cache.pop(cache_key, None)
+            scanner.metadata.invalidate_prefix(path, *affected_paths)
+        self._invalidate_shell_completions()
 
     def clear_cache(self):
-        self.path_completer.scanner._cache.clear()
-        self.path_completer.scanner._cache_time.clear()
-        self.path_completer.scanner.metadata.clear_cache()
+        scanner = self.path_completer.scanner
+        with scanner._lock:
+            scanner._cache.clear()
+            scanner._cache_time.clear()
+            scanner.metadata.clear_cache()
+        _shell_available.cache_clear()
+        self._invalidate_shell_completions()
+
+    def _invalidate_shell_completions(self):
+        runner = self.path_completer.universal_completion_runner
+        if runner is not None:
+            runner.invalidate()
 
     def refresh_directory(self, path: str = None):
-        self.update_cache(path)
+        with self.path_completer.scanner._lock:
+            self.update_cache(path)
 
     def set_show_hidden(self, show_hidden: bool):
         pass
@@ -1,14 +1,329 @@
 #!/usr/bin/env python3
-import configparser
+import functools
 import json
 import os
 import re
 import shutil
 import subprocess
+import sys
+import threading
+import time
 from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSON_READ_MODE = "rb"
+
+    def _write_json_file(
+        path: Path, data, indent: bool = True, stream: bool = False
+    ) -> bool:
+        # orjson builds the whole document in C in one call, so there is
+        # nothing to gain from streaming.
+        payload = orjson.dumps(
+            data,
+            option=(orjson.OPT_INDENT_2 if indent else 0) | orjson.OPT_NON_STR_KEYS,
+        )
+        return _atomic_write_bytes(path, payload)
+
+except ImportError:  # orjson is optional; the stdlib codec is the fallback
+    _json_loads = json.loads
+    _JSON_READ_MODE = "r"
+
+    def _write_json_file(
+        path: Path, data, indent: bool = True, stream: bool = False
+    ) -> bool:
+        # Compact files are machine-read only, so they take the faster
+        # ASCII-escaping path; indented ones are meant for editing and keep
+        # their icons and symbols readable.
+        if indent:
+            encoder = json.JSONEncoder(indent=2, ensure_ascii=False)
+        else:
+            encoder = json.JSONEncoder()
+        if not stream:
+            # One encode() is several times faster than iterencode() and
+            # small files gain nothing from streaming.
+            return _atomic_write_bytes(path, encoder.encode(data).encode("utf-8"))
+        # Large dumps stream the encoder's output instead of holding the
+        # whole document as one string.
+        chunks = (chunk.encode("utf-8") for chunk in encoder.iterencode(data))
+        return _atomic_write_chunks(path, chunks)
+
+
+def _atomic_write_bytes(path: Path, payload: bytes) -> bool:
+    """Write ``payload`` beside ``path`` and swap it in with os.replace.
+
+    Readers see either the old file or the new one, never a truncated one.
+    Nothing is written when the file already holds ``payload``; returns
+    whether a write happened.
+    """
+    try:
+        if path.read_bytes() == payload:
+            return False
+    except OSError:
+        pass
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    return True
+
+
+def _atomic_write_chunks(path: Path, chunks: Iterable[bytes]) -> bool:
+    """Streaming counterpart of _atomic_write_bytes.
+
+    The existing file is compared as the chunks are written out; when it
+    already holds the same bytes the temp file is dropped and ``path`` is
+    left untouched.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        existing = path.open("rb")
+    except OSError:
+        existing = None
+    same = existing is not None
+    try:
+        with tmp_path.open("wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                if same and existing.read(len(chunk)) != chunk:
+                    same = False
+        if same and not existing.read(1):
+            tmp_path.unlink()
+            return False
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    finally:
+        if existing is not None:
+            existing.close()
+    return True
+
+
+# (section, key, Config attribute, accepted type, how to apply) for every
+# option read from config.json; `object` accepts any JSON value.
+_CONFIG_SCHEMA = (
+    ("general", "welcome_message", "WELCOME_MESSAGE", object, "assign"),
+    ("general", "show_startup_banner", "SHOW_STARTUP_BANNER", object, "assign"),
+    ("general", "refresh_rate", "REFRESH_RATE", object, "assign"),
+    ("shell", "max_shell_context", "MAX_SHELL_CONTEXT", object, "assign"),
+    ("shell", "interactive_commands", "INTERACTIVE_COMMANDS", list, "to_set"),
+    ("shell", "streaming_commands", "STREAMING_COMMANDS", list, "to_set"),
+    (
+        "shell",
+        "shell_stream_summary_panel",
+        "SHELL_STREAM_SUMMARY_PANEL",
+        object,
+        "assign",
+    ),
+    (
+        "shell",
+        "shell_stream_output_panel",
+        "SHELL_STREAM_OUTPUT_PANEL",
+        object,
+        "assign",
+    ),
+    ("shell", "cd_feedback_enabled", "CD_FEEDBACK_ENABLED", object, "assign"),
+    ("shell", "default_shell", "DEFAULT_SHELL", object, "assign"),
+    ("shell", "choice_default_shell", "CHOICE_DEFAULT_SHELL", object, "assign"),
+    ("ui", "help_keybinds", "HELP_KEYBINDS", list, "to_tuples"),
+    ("ui", "help_special_commands", "HELP_SPECIAL_COMMANDS", list, "to_tuples"),
+    ("ui", "prompt_styles", "PROMPT_STYLES", dict, "update_styles"),
+    ("ui", "completion_styles", "COMPLETION_STYLES", dict, "update_styles"),
+    ("ui", "panel_styles", "PANEL_STYLES", dict, "update_styles"),
+    ("ui", "highlighter_enabled", "HIGHLIGHTER_ENABLED", object, "assign"),
+    ("ui", "highlighter_rules", "HIGHLIGHTER_RULES", list, "assign"),
+    ("ui", "highlighter_styles", "HIGHLIGHTER_STYLES", dict, "update"),
+    ("ui", "lexer_styles", "LEXER_STYLES", dict, "update_styles"),
+    ("ui", "command_highlight", "COMMAND_HIGHLIGHT", dict, "update"),
+    ("ui", "path_highlight", "PATH_HIGHLIGHT", dict, "update"),
+    ("ui", "completion_auto_popup", "COMPLETION_AUTO_POPUP", object, "assign"),
+    (
+        "ui",
+        "completion_max_candidates",
+        "COMPLETION_MAX_CANDIDATES",
+        object,
+        "assign",
+    ),
+    (
+        "ui",
+        "refresh_interval_enabled",
+        "UI_REFRESH_INTERVAL_ENABLED",
+        object,
+        "assign",
+    ),
+    ("ui", "prompt_symbol", "PROMPT_SYMBOL", object, "assign"),
+    ("ui", "prompt_template_top", "PROMPT_TEMPLATE_TOP", object, "assign"),
+    ("ui", "prompt_template_bottom", "PROMPT_TEMPLATE_BOTTOM", object, "assign"),
+    ("ui", "prompt_placeholder", "PROMPT_PLACEHOLDER", object, "assign"),
+    ("ui", "choice_prompt_lexer", "CHOICE_PROMPT_LEXER", object, "assign"),
+    ("syntax", "syntax_extensions", "SYNTAX_EXTENSIONS", dict, "update"),
+    (
+        "syntax",
+        "syntax_highlight_commands",
+        "SYNTAX_HIGHLIGHT_COMMANDS",
+        list,
+        "to_frozenset",
+    ),
+    ("syntax", "syntax_theme", "SYNTAX_THEME", str, "assign"),
+    ("syntax", "ls_commands", "LS_COMMANDS", list, "to_frozenset"),
+    ("syntax", "file_icons", "FILE_ICONS", dict, "update"),
+    ("syntax", "file_colors", "FILE_COLORS", dict, "update"),
+    ("syntax", "file_extensions", "FILE_EXTENSIONS", dict, "update"),
+    ("syntax", "bash_completion_files", "BASH_COMPLETION_FILES", list, "assign"),
+    ("syntax", "bash_completion_dirs", "BASH_COMPLETION_DIRS", list, "assign"),
+    ("syntax", "fish_completion_dirs", "FISH_COMPLETION_DIRS", list, "assign"),
+    ("syntax", "zsh_completion_dirs", "ZSH_COMPLETION_DIRS", list, "assign"),
+    (
+        "syntax",
+        "nushell_completion_dirs",
+        "NUSHELL_COMPLETION_DIRS",
+        list,
+        "assign",
+    ),
+    (
+        "syntax",
+        "enabled_completion_shells",
+        "ENABLED_COMPLETION_SHELLS",
+        list,
+        "to_frozenset",
+    ),
+    ("syntax", "completion_shell_order", "COMPLETION_SHELL_ORDER", list, "assign"),
+    (
+        "syntax",
+        "completion_min_token_len",
+        "COMPLETION_MIN_TOKEN_LEN",
+        int,
+        "assign",
+    ),
+)
+
+_MISSING = object()
+
+# config.ini sections carried over by the legacy migration.
+_KNOWN_SECTIONS = frozenset({"general", "shell", "ui", "syntax"})
+
+# Layout shared by every built-in panel style; only the border color differs.
+_PANEL_DEFAULTS = MappingProxyType(
+    {"padding": (0, 1), "title_align": "left", "expand": False}
+)
+
+# Lookup tables that are read-only once config.json has been applied.
+_FROZEN_MAPPINGS = (
+    "FILE_EXTENSIONS",
+    "FILE_ICONS",
+    "FILE_COLORS",
+    "LEXER_STYLES",
+    "PROMPT_STYLES",
+)
+
+
+def _intern_styles(styles: dict) -> dict:
+    """Intern style strings loaded from JSON so repeated colors share one object.
+
+    Literals in the class body are already shared by the compiler; values
+    parsed from config.json are fresh strings per occurrence.
+    """
+    interned = {}
+    for key, value in styles.items():
+        if isinstance(value, str):
+            value = sys.intern(value)
+        elif isinstance(value, dict):
+            value = _intern_styles(value)
+        interned[key] = value
+    return interned
+
+
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+_FALSY = frozenset({"0", "false", "no", "off"})
+
+# Raw environment value -> True / False, or None when it is neither. Keyed on
+# the value rather than the variable name so `export` inside the shell is
+# still honoured without re-normalizing the string on every call.
+_ENV_BOOL_CACHE: Dict[str, Optional[bool]] = {}
+
+
+def _env_bool(name: str, default: bool, unrecognized=_MISSING) -> bool:
+    """Boolean override from environment variable ``name``.
+
+    Unset variables give ``default``; values that are neither truthy nor
+    falsy give ``unrecognized`` (``default`` when not supplied).
+    """
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+
+    state = _ENV_BOOL_CACHE.get(raw, _MISSING)
+    if state is _MISSING:
+        normalized = raw.strip().lower()
+        if normalized in _TRUTHY:
+            state = True
+        elif normalized in _FALSY:
+            state = False
+        else:
+            state = None
+        _ENV_BOOL_CACHE[raw] = state
+
+    if state is None:
+        return default if unrecognized is _MISSING else unrecognized
+    return state
+
+
+class _ConfigMeta(type):
+    pass
+
+
+class _LazyConfigMeta(_ConfigMeta):
+    """Loads config.json on the first read or write of an UPPER_CASE setting.
+
+    Once loaded the class is switched to the plain _ConfigMeta, so later
+    attribute reads cost nothing extra. Writes load first as well, so a value
+    assigned before the first read is not overwritten by the load.
+    """
+
+    _load_lock = threading.RLock()
+    _loading = False
+
+    def __getattribute__(cls, name):
+        if name[:1].isupper():
+            _LazyConfigMeta._load(cls)
+        return type.__getattribute__(cls, name)
+
+    def __setattr__(cls, name, value):
+        if name[:1].isupper():
+            _LazyConfigMeta._load(cls)
+        type.__setattr__(cls, name, value)
+
+    @staticmethod
+    def _load(cls) -> None:
+        with _LazyConfigMeta._load_lock:
+            if _LazyConfigMeta._loading or type(cls) is not _LazyConfigMeta:
+                return
+            _LazyConfigMeta._loading = True
+            try:
+                # Command descriptions are left to ensure_directories() at
+                # app startup so apropos never runs on a plain attribute read.
+                cls._ensure_config_files()
+                cls._load_external_config()
+            finally:
+                cls.__class__ = _ConfigMeta
+                _LazyConfigMeta._loading = False
 
 
-class Config:
+class Config(metaclass=_LazyConfigMeta):
     # Shell configuration
     MAX_SHELL_CONTEXT = 10
 
@@ -93,10 +408,10 @@ class Config:
         ".txt": "text",
     }
 
-    SYNTAX_HIGHLIGHT_COMMANDS = ["cat", "head", "tail", "batcat", "bat"]
+    SYNTAX_HIGHLIGHT_COMMANDS = frozenset({"cat", "head", "tail", "batcat", "bat"})
     SYNTAX_THEME = "github-dark"
 
-    LS_COMMANDS = ["ls", "la", "lsd", "ll"]
+    LS_COMMANDS = frozenset({"ls", "la", "lsd", "ll"})
 
     FILE_ICONS = {
         "directory": "",
@@ -222,6 +537,21 @@ class Config:
     LOG_FILE = CONFIG_DIR / "shell.log"
     ALIAS_FILE = CONFIG_DIR / "aliases.json"
     COMMANDS_DESC_FILE = CONFIG_DIR / "commands_desc.json"
+    CACHE_DIR = (
+        Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "simpl_cli"
+    )
+    # Descriptions older than this are regenerated in the background.
+    COMMANDS_DESC_MAX_AGE = 7 * 24 * 60 * 60
+    _commands_desc_thread: Optional[threading.Thread] = None
+
+    # Parsed config.json and the (path, mtime) it was read at; reload()
+    # clears the mtime to force a re-read.
+    _json_cache: Optional[dict] = None
+    _json_cache_path: Optional[Path] = None
+    _json_cache_mtime: Optional[int] = None
+    # config.ini / config.json st_mtime_ns seen by the last full reload().
+    _last_ini_mtime: Optional[int] = None
+    _last_json_mtime: Optional[int] = None
 
     WELCOME_MESSAGE = "Welcome to Simple-CLI"
 
@@ -292,43 +622,26 @@ class Config:
         "~/.config/nushell/completions",
     ]
 
-    ENABLED_COMPLETION_SHELLS = ["bash", "fish", "zsh", "nushell"]
+    ENABLED_COMPLETION_SHELLS = frozenset({"bash", "fish", "zsh", "nushell"})
     COMPLETION_SHELL_ORDER = ["fish", "zsh", "bash", "nushell"]
+    # Shell completers are not consulted until the current word is at least
+    # this long (a trailing space, "/" or "-" always triggers them).
+    COMPLETION_MIN_TOKEN_LEN = 2
 
     PANEL_STYLES = {
-        "default": {
-            "border_style": "#888888",
-            "padding": (0, 1),
-            "title_align": "left",
-            "expand": False,
-        },
-        "info": {
-            "border_style": "#8caaee",
-            "padding": (0, 1),
-            "title_align": "left",
-            "expand": False,
-        },
-        "success": {
-            "border_style": "#a6d189",
-            "padding": (0, 1),
-            "title_align": "left",
-            "expand": False,
-        },
-        "error": {
-            "border_style": "#e78284",
-            "padding": (0, 1),
-            "title_align": "left",
-            "expand": False,
-        },
-        "warning": {
-            "border_style": "#e5c890",
-            "padding": (0, 1),
-            "title_align": "left",
-            "expand": False,
-        },
+        name: {"border_style": border_style, **_PANEL_DEFAULTS}
+        for name, border_style in (
+            ("default", "#888888"),
+            ("info", "#8caaee"),
+            ("success", "#a6d189"),
+            ("error", "#e78284"),
+            ("warning", "#e5c890"),
+        )
     }
 
     HIGHLIGHTER_ENABLED = True
+    # Applied in order; where matches overlap the later rule's style is
+    # layered on top, so "ip" stays after "number".
     HIGHLIGHTER_RULES = [
         {
             "name": "number",
@@ -353,6 +666,9 @@ class Config:
     }
 
     COMPLETION_AUTO_POPUP = True
+    # Bare Tab in a directory with more entries than this shows a hint
+    # instead of the full list (0 disables the limit).
+    COMPLETION_MAX_CANDIDATES = 500
     UI_REFRESH_INTERVAL_ENABLED = False
 
     COMMAND_HIGHLIGHT = {
@@ -394,12 +710,18 @@ class Config:
         "pygments.punctuation": "#f8f8f2",
     }
 
-    DEFAULT_SHELL = (
-        "/bin/bash" if os.name != "nt" else os.environ.get("COMSPEC", "cmd.exe")
-    )
+    # None means the platform default, resolved by default_shell().
+    DEFAULT_SHELL = None
 
     @classmethod
     def ensure_directories(cls):
+        # The lazy load creates the config files; run it now if nothing has
+        # read a setting yet instead of checking the files a second time.
+        _LazyConfigMeta._load(cls)
+        cls._ensure_command_descriptions()
+
+    @classmethod
+    def _ensure_config_files(cls) -> None:
         cls.CONFIG_DIR.mkdir(exist_ok=True)
 
         # Only create/config.json as primary config
@@ -416,25 +738,35 @@ class Config:
 
         if not cls.ALIAS_FILE.exists():
             cls.ALIAS_FILE.write_text("{}", encoding="utf-8")
-        cls._ensure_command_descriptions()
 
 
     @classmethod
+    @functools.lru_cache(maxsize=1)
+    def default_shell(cls) -> str:
+        if cls.DEFAULT_SHELL:
+            return cls.DEFAULT_SHELL
+        if os.name == "nt":
+            return os.environ.get("COMSPEC", "cmd.exe")
+        return "/bin/bash"
+
+    @classmethod
+    @functools.lru_cache(maxsize=1)
     def get_shell(cls) -> str:
         env_shell = os.getenv("WRAPCLI_SHELL")
         if env_shell:
             return env_shell
 
         if os.name == "nt":
-            return os.getenv("COMSPEC") or cls.DEFAULT_SHELL
+            return os.getenv("COMSPEC") or cls.default_shell()
 
         choice_shell = cls._resolve_shell_choice()
         if choice_shell:
             return choice_shell
 
-        return os.getenv("SHELL") or cls.DEFAULT_SHELL
+        return os.getenv("SHELL") or cls.default_shell()
 
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def _resolve_shell_choice(cls) -> str | None:
         choice = getattr(cls, "CHOICE_DEFAULT_SHELL", "auto")
         if not choice:
@@ -454,6 +786,13 @@ class Config:
 
         return None
 
+    @classmethod
+    def invalidate_shell_cache(cls) -> None:
+        """Forget the resolved shell so the next get_shell() looks it up again."""
+        cls.default_shell.cache_clear()
+        cls._resolve_shell_choice.cache_clear()
+        cls.get_shell.cache_clear()
+
     @classmethod
     def get_prompt_lexer_choice(cls) -> str:
         env_value = os.getenv("HYBRIDSHELL_PROMPT_LEXER")
@@ -464,464 +803,232 @@ class Config:
 
     @classmethod
     def is_shell_stream_summary_enabled(cls) -> bool:
-        env_value = os.getenv("WRAPCLI_SHELL_STREAM_PANEL")
-        if env_value is None:
-            return cls.SHELL_STREAM_SUMMARY_PANEL
-
-        normalized = env_value.strip().lower()
-        return normalized in {"1", "true", "yes", "on"}
+        return _env_bool(
+            "WRAPCLI_SHELL_STREAM_PANEL", cls.SHELL_STREAM_SUMMARY_PANEL, False
+        )
 
     @classmethod
     def is_shell_stream_output_panel_enabled(cls) -> bool:
-        env_value = os.getenv("WRAPCLI_SHELL_STREAM_OUTPUT_PANEL")
-        if env_value is None:
-            return cls.SHELL_STREAM_OUTPUT_PANEL
+        return _env_bool(
+            "WRAPCLI_SHELL_STREAM_OUTPUT_PANEL", cls.SHELL_STREAM_OUTPUT_PANEL, False
+        )
 
-        normalized = env_value.strip().lower()
-        return normalized in {"1", "true", "yes", "on"}
+    @staticmethod
+    def compile_highlighter_rules(
+        rules: List[dict],
+    ) -> List[Tuple["re.Pattern[str]", str]]:
+        """Compile highlighter rules into ``(regex, style)`` passes.
+
+        Each rule keeps its own pass, applied in order, so where matches
+        overlap a later rule's style is layered over an earlier one and
+        numbered backreferences keep their meaning. Invalid rules are
+        dropped.
+        """
+        passes = []
+        for rule in rules or []:
+            pattern = rule.get("pattern")
+            style = rule.get("style")
+            if not pattern or not style:
+                continue
 
-    @classmethod
-    def is_highlighter_enabled(cls) -> bool:
-        env_value = os.getenv("HYBRIDSHELL_HIGHLIGHTER")
-        if env_value is not None:
-            normalized = env_value.strip().lower()
-            if normalized in {"0", "false", "no", "off"}:
-                return False
-            if normalized in {"1", "true", "yes", "on"}:
-                return True
-        return cls.HIGHLIGHTER_ENABLED
+            style_value = Config.HIGHLIGHTER_STYLES.get(style, style)
+            if not style_value:
+                continue
 
-    # ------------------------------------------------------------------
-    # External configuration support (config.ini)
-    # ------------------------------------------------------------------
+            flags = re.MULTILINE
+            if rule.get("ignore_case"):
+                flags |= re.IGNORECASE
 
-    @classmethod
-    def _write_default_config(cls) -> None:
-        parser = configparser.ConfigParser()
+            try:
+                compiled = re.compile(pattern, flags)
+            except re.error:
+                continue
 
-        parser["general"] = {
-            "welcome_message": cls.WELCOME_MESSAGE,
-            "refresh_rate": str(cls.REFRESH_RATE),
-        }
+            passes.append((compiled, style_value))
 
-        parser["shell"] = {
-            "max_shell_context": str(cls.MAX_SHELL_CONTEXT),
-            "interactive_commands": json.dumps(sorted(cls.INTERACTIVE_COMMANDS)),
-            "streaming_commands": json.dumps(sorted(cls.STREAMING_COMMANDS)),
-            "shell_stream_summary_panel": str(cls.SHELL_STREAM_SUMMARY_PANEL),
-            "shell_stream_output_panel": str(cls.SHELL_STREAM_OUTPUT_PANEL),
-            "default_shell": cls.DEFAULT_SHELL,
-            "choice_default_shell": cls.CHOICE_DEFAULT_SHELL,
-        }
+        return passes
 
-        parser["ui"] = {
-            "help_keybinds": json.dumps([list(item) for item in cls.HELP_KEYBINDS]),
-            "help_special_commands": json.dumps(
-                [list(item) for item in cls.HELP_SPECIAL_COMMANDS]
-            ),
-            "prompt_styles": json.dumps(cls.PROMPT_STYLES),
-            "completion_styles": json.dumps(cls.COMPLETION_STYLES),
-            "panel_styles": json.dumps(cls.PANEL_STYLES),
-            "highlighter_enabled": str(cls.HIGHLIGHTER_ENABLED),
-            "highlighter_rules": json.dumps(cls.HIGHLIGHTER_RULES),
-            "highlighter_styles": json.dumps(cls.HIGHLIGHTER_STYLES),
-            "lexer_styles": json.dumps(cls.LEXER_STYLES),
-            "completion_auto_popup": str(cls.COMPLETION_AUTO_POPUP),
-            "prompt_symbol": cls.PROMPT_SYMBOL,
-            "prompt_template_top": cls.PROMPT_TEMPLATE_TOP,
-            "prompt_template_bottom": cls.PROMPT_TEMPLATE_BOTTOM,
-            "choice_prompt_lexer": cls.CHOICE_PROMPT_LEXER,
-        }
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def compiled_highlighter(cls) -> List[Tuple["re.Pattern[str]", str]]:
+        """Compiled passes for HIGHLIGHTER_RULES; cleared by reload()."""
+        return cls.compile_highlighter_rules(cls.HIGHLIGHTER_RULES)
 
-        parser["syntax"] = {
-            "syntax_extensions": json.dumps(cls.SYNTAX_EXTENSIONS),
-            "syntax_highlight_commands": json.dumps(cls.SYNTAX_HIGHLIGHT_COMMANDS),
-            "ls_commands": json.dumps(cls.LS_COMMANDS),
-            "file_icons": json.dumps(cls.FILE_ICONS),
-            "file_colors": json.dumps(cls.FILE_COLORS),
-            "file_extensions": json.dumps(cls.FILE_EXTENSIONS),
-            "bash_completion_files": json.dumps(cls.BASH_COMPLETION_FILES),
-            "bash_completion_dirs": json.dumps(cls.BASH_COMPLETION_DIRS),
-        }
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def bash_completion_dirs(cls) -> Tuple[Path, ...]:
+        return tuple(Path(p).expanduser() for p in cls.BASH_COMPLETION_DIRS)
 
-        with cls.CONFIG_FILE.open("w", encoding="utf-8") as config_handle:
-            parser.write(config_handle)
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def fish_completion_dirs(cls) -> Tuple[Path, ...]:
+        return tuple(Path(p).expanduser() for p in cls.FISH_COMPLETION_DIRS)
 
     @classmethod
-    def _load_external_config(cls) -> None:
-        # Load from JSON config only
-        # INI config is no longer supported
-        cls._load_json_config()
+    @functools.lru_cache(maxsize=1)
+    def zsh_completion_dirs(cls) -> Tuple[Path, ...]:
+        return tuple(Path(p).expanduser() for p in cls.ZSH_COMPLETION_DIRS)
 
-        # Note: If JSON config doesn't exist or fails to load,
-        # class defaults will remain unchanged
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def nushell_completion_dirs(cls) -> Tuple[Path, ...]:
+        return tuple(Path(p).expanduser() for p in cls.NUSHELL_COMPLETION_DIRS)
 
-    @staticmethod
-    def _json_override(
-        parser: configparser.ConfigParser, section: str, option: str, default
-    ):
-        if not parser.has_option(section, option):
-            return default
-        raw_value = parser.get(section, option)
-        try:
-            parsed = json.loads(raw_value)
-        except json.JSONDecodeError:
-            loose = Config._loose_sequence_parse(raw_value, default)
-            if loose is not None:
-                return loose
-            return default
-        return parsed
+    # Bits returned by command_flags().
+    CMD_INTERACTIVE = 1
+    CMD_STREAMING = 2
 
-    @staticmethod
-    def _loose_sequence_parse(raw_value: str, default):
-        if not isinstance(default, (list, tuple, set)):
-            return None
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _command_flags(cls) -> Dict[str, int]:
+        flags = dict.fromkeys(cls.INTERACTIVE_COMMANDS | cls.STREAMING_COMMANDS, 0)
+        for command in cls.INTERACTIVE_COMMANDS:
+            flags[command] |= cls.CMD_INTERACTIVE
+        for command in cls.STREAMING_COMMANDS:
+            flags[command] |= cls.CMD_STREAMING
+        return flags
 
-        sample_items = list(default) if not isinstance(default, set) else list(default)
-        if sample_items and not all(isinstance(item, str) for item in sample_items):
-            return None
+    @classmethod
+    def command_flags(cls, command: str) -> int:
+        """CMD_INTERACTIVE / CMD_STREAMING bits for a base command name."""
+        return cls._command_flags().get(command, 0)
 
-        stripped = raw_value.strip()
-        if not (stripped.startswith("[") and stripped.endswith("]")):
-            return None
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _ext_table(cls) -> Dict[str, Tuple[str, str, str, Optional[str]]]:
+        """Extension -> (category, icon, color, lexer); cleared by reload()."""
+        table = {}
+        for ext in cls.FILE_EXTENSIONS.keys() | cls.SYNTAX_EXTENSIONS.keys():
+            category = cls.FILE_EXTENSIONS.get(ext, "file")
+            icon, color = cls.category_style(category)
+            table[ext] = (category, icon, color, cls.SYNTAX_EXTENSIONS.get(ext))
+        return table
 
-        inner = stripped[1:-1]
-        if not inner.strip():
-            if isinstance(default, set):
-                return set()
-            if isinstance(default, tuple):
-                return tuple()
-            return []
-
-        items: list[str] = []
-        for part in inner.split(","):
-            normalized = part.strip()
-            if not normalized:
-                continue
+    @classmethod
+    def ext_lookup(cls, ext: str) -> Tuple[str, str, str, Optional[str]]:
+        entry = cls._ext_table().get(ext)
+        if entry is None:
+            icon, color = cls.category_style("file")
+            return ("file", icon, color, None)
+        return entry
 
-            if normalized[0] in {'"', "'"}:
-                normalized = normalized[1:]
-            if normalized and normalized[-1] in {'"', "'"}:
-                normalized = normalized[:-1]
+    @classmethod
+    @functools.lru_cache(maxsize=64)
+    def category_style(cls, category: str) -> Tuple[str, str]:
+        """(icon, color) for a file category, falling back to plain files."""
+        icon = cls.FILE_ICONS.get(category, cls.FILE_ICONS["file"])
+        color = cls.FILE_COLORS.get(category, cls.FILE_COLORS["file"])
+        return icon, color
 
-            normalized = normalized.strip()
-            if normalized:
-                items.append(normalized)
+    @classmethod
+    def is_highlighter_enabled(cls) -> bool:
+        return _env_bool("HYBRIDSHELL_HIGHLIGHTER", cls.HIGHLIGHTER_ENABLED)
 
-        if isinstance(default, set):
-            return set(items)
-        if isinstance(default, tuple):
-            return tuple(items)
-        return items
+    # ------------------------------------------------------------------
+    # External configuration support (config.json)
+    # ------------------------------------------------------------------
 
-    @staticmethod
-    def _tuple_list_override(
-        parser: configparser.ConfigParser, section: str, option: str, default
-    ):
-        fallback = [list(item) for item in default]
-        raw = Config._json_override(parser, section, option, fallback)
-        return [tuple(item) for item in raw]
+    @classmethod
+    def _load_external_config(cls) -> None:
+        # Load from JSON config only
+        # INI config is no longer supported
+        cls._load_json_config()
+
+        # Note: If JSON config doesn't exist or fails to load,
+        # class defaults will remain unchanged
 
     @classmethod
     def _load_json_config(cls) -> bool:
-        if not cls.CONFIG_JSON_FILE.exists():
+        try:
+            mtime = os.stat(cls.CONFIG_JSON_FILE).st_mtime_ns
+        except OSError:
             return False
 
+        if (
+            cls._json_cache is not None
+            and cls._json_cache_path == cls.CONFIG_JSON_FILE
+            and cls._json_cache_mtime == mtime
+        ):
+            return True
+
         try:
-            with cls.CONFIG_JSON_FILE.open("r", encoding="utf-8") as f:
-                config_data = json.load(f)
+            if _JSON_READ_MODE == "rb":
+                config_bytes = cls.CONFIG_JSON_FILE.read_bytes()
+                config_data = _json_loads(config_bytes)
+            else:
+                with cls.CONFIG_JSON_FILE.open("r", encoding="utf-8") as f:
+                    config_data = _json_loads(f.read())
         except (json.JSONDecodeError, OSError):
             return False
 
-        # Helper function to get nested value with fallback
-        def get_nested(data, *keys, default=None):
-            current = data
-            for key in keys:
-                if isinstance(current, dict) and key in current:
-                    current = current[key]
-                else:
-                    return default
-            return current
+        cls._json_cache = config_data
+        cls._json_cache_path = cls.CONFIG_JSON_FILE
+        cls._json_cache_mtime = mtime
 
-        # Load general section
-        cls.WELCOME_MESSAGE = get_nested(
-            config_data, "general", "welcome_message", default=cls.WELCOME_MESSAGE
-        )
-        cls.SHOW_STARTUP_BANNER = get_nested(
-            config_data,
-            "general",
-            "show_startup_banner",
-            default=cls.SHOW_STARTUP_BANNER,
-        )
-        cls.REFRESH_RATE = get_nested(
-            config_data, "general", "refresh_rate", default=cls.REFRESH_RATE
-        )
-
-        # Load shell section
-        cls.MAX_SHELL_CONTEXT = get_nested(
-            config_data, "shell", "max_shell_context", default=cls.MAX_SHELL_CONTEXT
-        )
-
-        interactive_commands = get_nested(
-            config_data,
-            "shell",
-            "interactive_commands",
-            default=list(cls.INTERACTIVE_COMMANDS),
-        )
-        if isinstance(interactive_commands, list):
-            cls.INTERACTIVE_COMMANDS = set(interactive_commands)
-
-        streaming_commands = get_nested(
-            config_data,
-            "shell",
-            "streaming_commands",
-            default=list(cls.STREAMING_COMMANDS),
-        )
-        if isinstance(streaming_commands, list):
-            cls.STREAMING_COMMANDS = set(streaming_commands)
-
-        cls.SHELL_STREAM_SUMMARY_PANEL = get_nested(
-            config_data,
-            "shell",
-            "shell_stream_summary_panel",
-            default=cls.SHELL_STREAM_SUMMARY_PANEL,
-        )
-        cls.SHELL_STREAM_OUTPUT_PANEL = get_nested(
-            config_data,
-            "shell",
-            "shell_stream_output_panel",
-            default=cls.SHELL_STREAM_OUTPUT_PANEL,
-        )
-        cls.CD_FEEDBACK_ENABLED = get_nested(
-            config_data,
-            "shell",
-            "cd_feedback_enabled",
-            default=cls.CD_FEEDBACK_ENABLED,
-        )
-        cls.DEFAULT_SHELL = get_nested(
-            config_data, "shell", "default_shell", default=cls.DEFAULT_SHELL
-        )
-        cls.CHOICE_DEFAULT_SHELL = get_nested(
-            config_data,
-            "shell",
-            "choice_default_shell",
-            default=cls.CHOICE_DEFAULT_SHELL,
-        )
-
-        # Load UI section
-        help_keybinds = get_nested(
-            config_data,
-            "ui",
-            "help_keybinds",
-            default=[list(item) for item in cls.HELP_KEYBINDS],
-        )
-        if isinstance(help_keybinds, list):
-            cls.HELP_KEYBINDS = [tuple(item) for item in help_keybinds]
-
-        help_special_commands = get_nested(
-            config_data,
-            "ui",
-            "help_special_commands",
-            default=[list(item) for item in cls.HELP_SPECIAL_COMMANDS],
-        )
-        if isinstance(help_special_commands, list):
-            cls.HELP_SPECIAL_COMMANDS = [tuple(item) for item in help_special_commands]
-
-        prompt_styles = get_nested(
-            config_data, "ui", "prompt_styles", default=cls.PROMPT_STYLES
-        )
-        if isinstance(prompt_styles, dict):
-            cls.PROMPT_STYLES.update(prompt_styles)
-
-        completion_styles = get_nested(
-            config_data, "ui", "completion_styles", default=cls.COMPLETION_STYLES
-        )
-        if isinstance(completion_styles, dict):
-            cls.COMPLETION_STYLES.update(completion_styles)
-
-        panel_styles = get_nested(
-            config_data, "ui", "panel_styles", default=cls.PANEL_STYLES
-        )
-        if isinstance(panel_styles, dict):
-            cls.PANEL_STYLES.update(panel_styles)
-
-        cls.HIGHLIGHTER_ENABLED = get_nested(
-            config_data, "ui", "highlighter_enabled", default=cls.HIGHLIGHTER_ENABLED
-        )
-
-        highlighter_rules = get_nested(
-            config_data, "ui", "highlighter_rules", default=cls.HIGHLIGHTER_RULES
-        )
-        if isinstance(highlighter_rules, list):
-            cls.HIGHLIGHTER_RULES = highlighter_rules
-
-        highlighter_styles = get_nested(
-            config_data, "ui", "highlighter_styles", default=cls.HIGHLIGHTER_STYLES
-        )
-        if isinstance(highlighter_styles, dict):
-            cls.HIGHLIGHTER_STYLES.update(highlighter_styles)
-
-        lexer_styles = get_nested(
-            config_data, "ui", "lexer_styles", default=cls.LEXER_STYLES
-        )
-        if isinstance(lexer_styles, dict):
-            cls.LEXER_STYLES.update(lexer_styles)
-
-        command_highlight = get_nested(
-            config_data, "ui", "command_highlight", default=cls.COMMAND_HIGHLIGHT
-        )
-        if isinstance(command_highlight, dict):
-            cls.COMMAND_HIGHLIGHT.update(command_highlight)
-
-        path_highlight = get_nested(
-            config_data, "ui", "path_highlight", default=cls.PATH_HIGHLIGHT
-        )
-        if isinstance(path_highlight, dict):
-            cls.PATH_HIGHLIGHT.update(path_highlight)
-
-        cls.COMPLETION_AUTO_POPUP = get_nested(
-            config_data,
-            "ui",
-            "completion_auto_popup",
-            default=cls.COMPLETION_AUTO_POPUP,
-        )
-        cls.UI_REFRESH_INTERVAL_ENABLED = get_nested(
-            config_data,
-            "ui",
-            "refresh_interval_enabled",
-            default=cls.UI_REFRESH_INTERVAL_ENABLED,
-        )
-        cls.PROMPT_SYMBOL = get_nested(
-            config_data, "ui", "prompt_symbol", default=cls.PROMPT_SYMBOL
-        )
-        cls.PROMPT_TEMPLATE_TOP = get_nested(
-            config_data, "ui", "prompt_template_top", default=cls.PROMPT_TEMPLATE_TOP
-        )
-        cls.PROMPT_TEMPLATE_BOTTOM = get_nested(
-            config_data,
-            "ui",
-            "prompt_template_bottom",
-            default=cls.PROMPT_TEMPLATE_BOTTOM,
-        )
-        cls.PROMPT_PLACEHOLDER = get_nested(
-            config_data, "ui", "prompt_placeholder", default=cls.PROMPT_PLACEHOLDER
-        )
-        cls.CHOICE_PROMPT_LEXER = get_nested(
-            config_data, "ui", "choice_prompt_lexer", default=cls.CHOICE_PROMPT_LEXER
-        )
-
-        # Load syntax section
-        syntax_extensions = get_nested(
-            config_data, "syntax", "syntax_extensions", default=cls.SYNTAX_EXTENSIONS
-        )
-        if isinstance(syntax_extensions, dict):
-            cls.SYNTAX_EXTENSIONS.update(syntax_extensions)
-
-        syntax_highlight_commands = get_nested(
-            config_data,
-            "syntax",
-            "syntax_highlight_commands",
-            default=cls.SYNTAX_HIGHLIGHT_COMMANDS,
-        )
-        if isinstance(syntax_highlight_commands, list):
-            cls.SYNTAX_HIGHLIGHT_COMMANDS = syntax_highlight_commands
-
-        syntax_theme = get_nested(
-            config_data,
-            "syntax",
-            "syntax_theme",
-            default=cls.SYNTAX_THEME,
-        )
-        if isinstance(syntax_theme, str):
-            cls.SYNTAX_THEME = syntax_theme
+        if not isinstance(config_data, dict):
+            return True
 
-        ls_commands = get_nested(
-            config_data, "syntax", "ls_commands", default=cls.LS_COMMANDS
-        )
-        if isinstance(ls_commands, list):
-            cls.LS_COMMANDS = ls_commands
+        # Index every option once so each schema row is a single lookup.
+        flat = {
+            (section, key): value
+            for section, options in config_data.items()
+            if isinstance(options, dict)
+            for key, value in options.items()
+        }
 
-        file_icons = get_nested(
-            config_data, "syntax", "file_icons", default=cls.FILE_ICONS
-        )
-        if isinstance(file_icons, dict):
-            cls.FILE_ICONS.update(file_icons)
+        for section, key, attr, expected, op in _CONFIG_SCHEMA:
+            value = flat.get((section, key), _MISSING)
+            if value is _MISSING:
+                continue
 
-        file_colors = get_nested(
-            config_data, "syntax", "file_colors", default=cls.FILE_COLORS
-        )
-        if isinstance(file_colors, dict):
-            cls.FILE_COLORS.update(file_colors)
+            # Mapping merges go through value.items(), which already rejects
+            # anything that is not a dict, so they skip the type check. Other
+            # objects hold on to the mutable tables, so those are updated in
+            # place; only read-only proxies are merged into a fresh copy.
+            if op in ("update", "update_styles"):
+                try:
+                    items = (
+                        value.items() if op == "update" else _intern_styles(value)
+                    )
+                except AttributeError:
+                    continue
+                table = getattr(cls, attr)
+                if isinstance(table, MappingProxyType):
+                    table = dict(table)
+                    table.update(items)
+                    setattr(cls, attr, table)
+                else:
+                    table.update(items)
+                continue
 
-        file_extensions = get_nested(
-            config_data, "syntax", "file_extensions", default=cls.FILE_EXTENSIONS
-        )
-        if isinstance(file_extensions, dict):
-            cls.FILE_EXTENSIONS.update(file_extensions)
-
-        bash_completion_files = get_nested(
-            config_data,
-            "syntax",
-            "bash_completion_files",
-            default=cls.BASH_COMPLETION_FILES,
-        )
-        if isinstance(bash_completion_files, list):
-            cls.BASH_COMPLETION_FILES = bash_completion_files
-
-        bash_completion_dirs = get_nested(
-            config_data,
-            "syntax",
-            "bash_completion_dirs",
-            default=cls.BASH_COMPLETION_DIRS,
-        )
-        if isinstance(bash_completion_dirs, list):
-            cls.BASH_COMPLETION_DIRS = bash_completion_dirs
-
-        fish_completion_dirs = get_nested(
-            config_data,
-            "syntax",
-            "fish_completion_dirs",
-            default=cls.FISH_COMPLETION_DIRS,
-        )
-        if isinstance(fish_completion_dirs, list):
-            cls.FISH_COMPLETION_DIRS = fish_completion_dirs
-
-        zsh_completion_dirs = get_nested(
-            config_data,
-            "syntax",
-            "zsh_completion_dirs",
-            default=cls.ZSH_COMPLETION_DIRS,
-        )
-        if isinstance(zsh_completion_dirs, list):
-            cls.ZSH_COMPLETION_DIRS = zsh_completion_dirs
-
-        nushell_completion_dirs = get_nested(
-            config_data,
-            "syntax",
-            "nushell_completion_dirs",
-            default=cls.NUSHELL_COMPLETION_DIRS,
-        )
-        if isinstance(nushell_completion_dirs, list):
-            cls.NUSHELL_COMPLETION_DIRS = nushell_completion_dirs
-
-        enabled_completion_shells = get_nested(
-            config_data,
-            "syntax",
-            "enabled_completion_shells",
-            default=cls.ENABLED_COMPLETION_SHELLS,
-        )
-        if isinstance(enabled_completion_shells, list):
-            cls.ENABLED_COMPLETION_SHELLS = enabled_completion_shells
-
-        completion_shell_order = get_nested(
-            config_data,
-            "syntax",
-            "completion_shell_order",
-            default=cls.COMPLETION_SHELL_ORDER,
-        )
-        if isinstance(completion_shell_order, list):
-            cls.COMPLETION_SHELL_ORDER = completion_shell_order
+            if expected is not object and not isinstance(value, expected):
+                continue
 
+            if op == "assign":
+                setattr(cls, attr, value)
+            elif op == "to_set":
+                setattr(cls, attr, set(value))
+            elif op == "to_frozenset":
+                setattr(cls, attr, frozenset(value))
+            elif op == "to_tuples":
+                setattr(cls, attr, [tuple(item) for item in value])
+
+        for attr in _FROZEN_MAPPINGS:
+            table = getattr(cls, attr)
+            if not isinstance(table, MappingProxyType):
+                setattr(cls, attr, MappingProxyType(table))
+
+        # Derived tables were built from the previous values; rebuild the
+        # highlighter passes right away so no output is scanned uncompiled.
+        cls._command_flags.cache_clear()
+        cls.bash_completion_dirs.cache_clear()
+        cls.fish_completion_dirs.cache_clear()
+        cls.zsh_completion_dirs.cache_clear()
+        cls.nushell_completion_dirs.cache_clear()
+        cls._ext_table.cache_clear()
+        cls.category_style.cache_clear()
+        cls.compiled_highlighter.cache_clear()
+        cls.compiled_highlighter()
         return True
 
     @classmethod
@@ -929,7 +1036,9 @@ class Config:
         if not cls.CONFIG_FILE.exists():
             return False
 
-        # Load INI config using existing parser
+        # Only the one-time legacy migration needs configparser.
+        import configparser
+
         parser = configparser.ConfigParser()
         try:
             parser.read(cls.CONFIG_FILE, encoding="utf-8")
@@ -940,52 +1049,74 @@ class Config:
         config_data = {}
 
         # Helper to parse JSON strings from INI
-        def parse_ini_value(section, option, default):
-            if not parser.has_option(section, option):
-                return default
-
-            value = parser.get(section, option)
+        def parse_ini_value(value):
             # Try to parse as JSON first
             try:
                 return json.loads(value)
             except json.JSONDecodeError:
-                # For simple strings/numbers/booleans
-                if value.lower() in ("true", "false"):
-                    return value.lower() == "true"
+                pass
+            # For simple strings/numbers/booleans; classify by shape so plain
+            # strings fall through without raising.
+            lowered = value.lower()
+            if lowered in ("true", "false"):
+                return lowered == "true"
+            digits = value[1:] if value.startswith(("+", "-")) else value
+            if digits.isdecimal():
+                return int(value)
+            whole, dot, frac = digits.partition(".")
+            if dot and (whole or frac) and (whole + frac).isdecimal():
+                return float(value)
+            # Rarer spellings (1_000, 1e5, inf, nan) still go through the
+            # builtins.
+            if digits.lower() in ("inf", "infinity", "nan") or any(
+                ch.isdecimal() for ch in digits
+            ):
                 try:
                     return int(value)
                 except ValueError:
                     try:
                         return float(value)
                     except ValueError:
-                        return value
+                        pass
+            return value
+
+        # Options whose default is a bool or int get a typed fast path that
+        # skips the JSON attempt; anything it can't decide falls through to
+        # parse_ini_value.
+        def parse_ini_bool(value):
+            lowered = value.lower()
+            if lowered in ("true", "false"):
+                return lowered == "true"
+            return parse_ini_value(value)
+
+        def parse_ini_int(value):
+            if value.isdecimal():
+                return int(value)
+            return parse_ini_value(value)
+
+        coercers = {}
+        for section, option, attr, _expected, _op in _CONFIG_SCHEMA:
+            default = cls.__dict__.get(attr)
+            if isinstance(default, bool):
+                coercers[section, option] = parse_ini_bool
+            elif isinstance(default, int):
+                coercers[section, option] = parse_ini_int
 
         # Convert each section
         for section in parser.sections():
-            config_data[section] = {}
-            for option in parser.options(section):
-                # Map INI option names to nested structure
-                if section == "general":
-                    config_data[section][option] = parse_ini_value(
-                        section, option, getattr(cls, option.upper(), "")
-                    )
-                elif section == "shell":
-                    config_data[section][option] = parse_ini_value(
-                        section, option, getattr(cls, option.upper(), "")
-                    )
-                elif section == "ui":
-                    config_data[section][option] = parse_ini_value(
-                        section, option, getattr(cls, option.upper(), "")
-                    )
-                elif section == "syntax":
-                    config_data[section][option] = parse_ini_value(
-                        section, option, getattr(cls, option.upper(), "")
-                    )
+            if section not in _KNOWN_SECTIONS:
+                config_data[section] = {}
+                continue
+            # items() merges DEFAULT and interpolates once per section,
+            # where get() rebuilt that lookup chain for every option.
+            config_data[section] = {
+                option: coercers.get((section, option), parse_ini_value)(value)
+                for option, value in parser.items(section)
+            }
 
         # Write JSON file
         try:
-            with cls.CONFIG_JSON_FILE.open("w", encoding="utf-8") as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
+            _write_json_file(cls.CONFIG_JSON_FILE, config_data)
             return True
         except OSError:
             return False
@@ -1005,24 +1136,24 @@ class Config:
                 "shell_stream_summary_panel": cls.SHELL_STREAM_SUMMARY_PANEL,
                 "shell_stream_output_panel": cls.SHELL_STREAM_OUTPUT_PANEL,
                 "cd_feedback_enabled": cls.CD_FEEDBACK_ENABLED,
-                "default_shell": cls.DEFAULT_SHELL,
+                "default_shell": cls.default_shell(),
                 "choice_default_shell": cls.CHOICE_DEFAULT_SHELL,
             },
             "ui": {
-                "help_keybinds": [list(item) for item in cls.HELP_KEYBINDS],
-                "help_special_commands": [
-                    list(item) for item in cls.HELP_SPECIAL_COMMANDS
-                ],
-                "prompt_styles": cls.PROMPT_STYLES,
+                # Both encoders write tuples as arrays, so no list() copies.
+                "help_keybinds": cls.HELP_KEYBINDS,
+                "help_special_commands": cls.HELP_SPECIAL_COMMANDS,
+                "prompt_styles": dict(cls.PROMPT_STYLES),
                 "completion_styles": cls.COMPLETION_STYLES,
                 "panel_styles": cls.PANEL_STYLES,
                 "highlighter_enabled": cls.HIGHLIGHTER_ENABLED,
                 "highlighter_rules": cls.HIGHLIGHTER_RULES,
                 "highlighter_styles": cls.HIGHLIGHTER_STYLES,
-                "lexer_styles": cls.LEXER_STYLES,
+                "lexer_styles": dict(cls.LEXER_STYLES),
                 "command_highlight": cls.COMMAND_HIGHLIGHT,
                 "path_highlight": cls.PATH_HIGHLIGHT,
                 "completion_auto_popup": cls.COMPLETION_AUTO_POPUP,
+                "completion_max_candidates": cls.COMPLETION_MAX_CANDIDATES,
                 "refresh_interval_enabled": cls.UI_REFRESH_INTERVAL_ENABLED,
                 "prompt_symbol": cls.PROMPT_SYMBOL,
                 "prompt_template_top": cls.PROMPT_TEMPLATE_TOP,
@@ -1032,87 +1163,145 @@ class Config:
             },
             "syntax": {
                 "syntax_extensions": cls.SYNTAX_EXTENSIONS,
-                "syntax_highlight_commands": cls.SYNTAX_HIGHLIGHT_COMMANDS,
+                "syntax_highlight_commands": sorted(cls.SYNTAX_HIGHLIGHT_COMMANDS),
                 "syntax_theme": cls.SYNTAX_THEME,
-                "ls_commands": cls.LS_COMMANDS,
-                "file_icons": cls.FILE_ICONS,
-                "file_colors": cls.FILE_COLORS,
-                "file_extensions": cls.FILE_EXTENSIONS,
+                "ls_commands": sorted(cls.LS_COMMANDS),
+                "file_icons": dict(cls.FILE_ICONS),
+                "file_colors": dict(cls.FILE_COLORS),
+                "file_extensions": dict(cls.FILE_EXTENSIONS),
                 "bash_completion_files": cls.BASH_COMPLETION_FILES,
                 "bash_completion_dirs": cls.BASH_COMPLETION_DIRS,
                 "fish_completion_dirs": cls.FISH_COMPLETION_DIRS,
                 "zsh_completion_dirs": cls.ZSH_COMPLETION_DIRS,
                 "nushell_completion_dirs": cls.NUSHELL_COMPLETION_DIRS,
-                "enabled_completion_shells": cls.ENABLED_COMPLETION_SHELLS,
+                "enabled_completion_shells": sorted(cls.ENABLED_COMPLETION_SHELLS),
                 "completion_shell_order": cls.COMPLETION_SHELL_ORDER,
+                "completion_min_token_len": cls.COMPLETION_MIN_TOKEN_LEN,
             },
         }
 
         try:
-            with cls.CONFIG_JSON_FILE.open("w", encoding="utf-8") as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
+            _write_json_file(cls.CONFIG_JSON_FILE, config_data)
         except OSError:
             pass
 
     @classmethod
     def _ensure_command_descriptions(cls) -> None:
-        refresh_env = os.getenv("WRAPCLI_REFRESH_COMMANDS_DESC", "").strip().lower()
-        refresh_requested = refresh_env in {"1", "true", "yes", "on"}
-        if cls.COMMANDS_DESC_FILE.exists() and not refresh_requested:
+        refresh_requested = _env_bool("WRAPCLI_REFRESH_COMMANDS_DESC", False)
+        try:
+            mtime = cls.COMMANDS_DESC_FILE.stat().st_mtime
+        except OSError:
+            # Nothing to serve yet, build it now.
+            cls._generate_command_descriptions()
+            return
+
+        # Serve the existing file and refresh it off the startup path.
+        stale = time.time() - mtime > cls.COMMANDS_DESC_MAX_AGE
+        if not (refresh_requested or stale):
             return
-        cls._generate_command_descriptions()
+        thread = cls._commands_desc_thread
+        if thread is not None and thread.is_alive():
+            return
+        thread = threading.Thread(
+            target=cls._generate_command_descriptions,
+            name="commands-desc-refresh",
+            daemon=True,
+        )
+        cls._commands_desc_thread = thread
+        thread.start()
 
     @classmethod
     def _generate_command_descriptions(cls) -> None:
         try:
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 ["apropos", "-s", "1,8", "."],
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=15,
+                errors="replace",
+                bufsize=1,
             )
-        except FileNotFoundError:
-            return
-        except subprocess.SubprocessError:
+        except (OSError, subprocess.SubprocessError):
             return
 
-        if result.returncode != 0 or not result.stdout:
-            return
-
-        pattern = re.compile(r"^(\S+)\s+\(.*\)\s+-\s+(.*)")
+        # Parse lines as apropos emits them; the timer kills a hung run.
+        timer = threading.Timer(15, proc.kill)
+        timer.daemon = True
+        timer.start()
         commands = {}
-
-        for line in result.stdout.splitlines():
-            match = pattern.match(line.strip())
-            if not match:
-                continue
-            command = match.group(1).strip()
-            description = match.group(2).strip()
-            if not command or len(command) >= 50:
-                continue
-            commands[command] = description
-
-        if not commands:
+        returncode = None
+        try:
+            with proc.stdout:
+                # Lines look like "name (section)   - description".
+                for line in proc.stdout:
+                    # Substring test rejects malformed lines before any
+                    # splitting allocates.
+                    if " - " not in line:
+                        continue
+                    parts = line.strip().split(None, 1)
+                    if len(parts) != 2:
+                        continue
+                    command, rest = parts
+                    if not rest.startswith("("):
+                        continue
+                    section, sep, description = rest.partition(" - ")
+                    if not sep or not section.rstrip().endswith(")"):
+                        continue
+                    if len(command) >= 50:
+                        continue
+                    commands[command] = description.strip()
+            returncode = proc.wait()
+        finally:
+            timer.cancel()
+            # Parsing failed part-way: don't leave apropos running or unreaped.
+            if returncode is None:
+                proc.kill()
+                proc.wait()
+
+        if returncode != 0 or not commands:
             return
 
         try:
-            cls.COMMANDS_DESC_FILE.write_text(
-                json.dumps(commands, ensure_ascii=False),
-                encoding="utf-8",
-            )
+            if not _write_json_file(
+                cls.COMMANDS_DESC_FILE, commands, indent=False, stream=True
+            ):
+                # Unchanged, but freshly checked: reset the staleness clock.
+                os.utime(cls.COMMANDS_DESC_FILE)
         except OSError:
             pass
 
+    @staticmethod
+    def _mtime_ns(path: Path) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
     @classmethod
-    def reload(cls) -> bool:
+    def reload(cls, force: bool = False) -> bool:
+        # Environment-derived caches are cheap to drop and may have changed
+        # even when the files have not.
+        cls.invalidate_shell_cache()
+        _ENV_BOOL_CACHE.clear()
+
+        ini_mtime = cls._mtime_ns(cls.CONFIG_FILE)
+        json_mtime = cls._mtime_ns(cls.CONFIG_JSON_FILE)
+        if (
+            not force
+            and json_mtime is not None
+            and ini_mtime == cls._last_ini_mtime
+            and json_mtime == cls._last_json_mtime
+        ):
+            return True
+
+        cls._json_cache_mtime = None
         try:
-            cls.ensure_directories()
-            cls._load_external_config()
+            cls._ensure_config_files()
             cls._ensure_command_descriptions()
-            return True
+            cls._load_external_config()
         except Exception:
             return False
+        cls._last_ini_mtime = cls._mtime_ns(cls.CONFIG_FILE)
+        cls._last_json_mtime = cls._mtime_ns(cls.CONFIG_JSON_FILE)
+        return True
 
-
-Config.ensure_directories()
-Config._load_external_config()
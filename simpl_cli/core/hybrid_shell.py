@@ -1,6 +1,13 @@
 #!/usr/bin/env python3
 from typing import Optional
+import atexit
+import bisect
+import datetime
+import functools
 import os
+import queue
+import stat
+import threading
 import hashlib
 from pathlib import Path
 
@@ -30,6 +37,111 @@ try:
 except ImportError:
     find_lexer_class_by_name = None
 
+try:
+    import ahocorasick
+except ImportError:  # optional; command highlighting falls back to regexes
+    ahocorasick = None
+
+
+# Plain decimal/scientific spellings; float() is only consulted for the rare
+# forms this misses (underscores, inf, nan).
+_FLOAT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?\Z")
+
+
+_TOKEN_RE = re.compile(r"\S+")
+
+# Shell operators: a pipe/list operator ends the argument scan, a redirection
+# makes the next token a redirect target rather than an argument.
+_PIPE_OPS = frozenset({"|", "&&", "||", ";", ">", "<", ">>", "2>", "&>"})
+_REDIR_OPS = frozenset({">", "<", ">>", "2>", "&>"})
+
+# Characters _are_delimiters_balanced reacts to; everything else is skipped
+# by the regex engine rather than visited one by one in Python.
+_DELIMITER_RE = re.compile(r"[\\'\"`{}\[\]()]")
+_CLOSING_FOR = {"{": "}", "[": "]", "(": ")"}
+# Scanner state with nothing left open: no brackets, no quote.
+_DELIMITERS_CLEAR = ((), "")
+
+# Substring -> shell type, checked in order ("bash" before "nu" and so on).
+_SHELL_TYPES = {
+    "bash": "bash",
+    "zsh": "zsh",
+    "fish": "fish",
+    "nu": "nushell",
+    "xonsh": "xonsh",
+}
+
+# Block-continuation suffixes and standalone block terminators for bash/zsh.
+_BASH_BLOCK_OPENERS = ("do", "then", "in", "\\")
+_FALLBACK_BLOCK_OPENERS = ("do", "then", "in", "{", "\\")
+_BASH_END_TOKENS = frozenset({"fi", "done", "esac", "}"})
+_BASH_END_SUFFIXES = ("; fi", "; done", "; esac")
+# First-line shapes of bash/zsh blocks that only end at fi/done/esac.
+_BASH_EXPLICIT_END_PREFIXES = ("for ", "if ", "while ", "until ", "case ")
+
+
+def _is_float(text: str) -> bool:
+    if _FLOAT_RE.match(text):
+        return True
+    if "_" not in text and text.lstrip("+-").lower() not in (
+        "inf",
+        "infinity",
+        "nan",
+    ):
+        return False
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _is_word_boundary(text: str, index: int) -> bool:
+    """Same test as regex ``\\b`` at ``index``."""
+    before = index > 0 and (text[index - 1].isalnum() or text[index - 1] == "_")
+    after = index < len(text) and (text[index].isalnum() or text[index] == "_")
+    return before != after
+
+
+def _path_mode(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mode
+    except (OSError, ValueError):
+        return None
+
+
+class _MemoizedProcessor(Processor):
+    """Processor that replays its last Transformation for identical input.
+
+    prompt_toolkit re-runs processors on cursor moves and periodic redraws
+    where neither the text nor the incoming fragments changed. Subclasses
+    implement ``_transform``.
+    """
+
+    _memo_key = None
+    _memo_fragments = None
+    _memo_result = None
+
+    def apply_transformation(self, transformation_input):
+        key = (transformation_input.lineno, transformation_input.document.text)
+        fragments = transformation_input.fragments
+        if key == self._memo_key and fragments == self._memo_fragments:
+            return self._memo_result
+
+        result = self._transform(transformation_input)
+        self._memo_key = key
+        self._memo_fragments = fragments
+        self._memo_result = result
+        return result
+
+    def reset_memo(self):
+        self._memo_key = None
+        self._memo_fragments = None
+        self._memo_result = None
+
+    def _transform(self, transformation_input):
+        raise NotImplementedError
+
 
 class DummyContextManager:
 
@@ -48,6 +160,35 @@ class DirectoryFilteredAutoSuggest(AutoSuggest):
     def __init__(self, history: FileHistory, shell_instance=None):
         self.history = history
         self.shell = shell_instance
+        # Parsed history and the (filename, mtime, size) it was read at.
+        self._hist_cache = None
+        self._hist_key = None
+        # Non-blank entries sorted by text, each with its recency (0 is the
+        # newest), so a prefix lookup is a bisect instead of a full scan.
+        self._hist_sorted = []
+        self._hist_sorted_keys = []
+
+    def _load_history_strings(self):
+        ensure_file = getattr(self.history, "_ensure_correct_history_file", None)
+        if ensure_file is not None:
+            ensure_file()
+        filename = self.history.filename
+        try:
+            st = os.stat(filename)
+            key = (filename, st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+
+        if key is None or key != self._hist_key:
+            self._hist_cache = list(self.history.load_history_strings())
+            self._hist_key = key
+            self._hist_sorted = sorted(
+                (entry, recency)
+                for recency, entry in enumerate(self._hist_cache)
+                if entry and entry.strip()
+            )
+            self._hist_sorted_keys = [entry for entry, _ in self._hist_sorted]
+        return self._hist_cache
 
     def get_suggestion(self, buffer, document):
         current_text = document.text
@@ -56,57 +197,44 @@ class DirectoryFilteredAutoSuggest(AutoSuggest):
             return None
 
         try:
-            history_strings = list(self.history.load_history_strings())
+            self._load_history_strings()
         except Exception:
             return None
 
-        best_suggestion = None
-        best_match_length = 0
-
-        for history_str in history_strings:
-            if not history_str or not history_str.strip():
-                continue
-
-            suggestion_text = self._get_suggestion_text(current_text, history_str)
-            if suggestion_text is not None:
-                if self._is_suggestion_valid(history_str):
-                    if len(history_str) > best_match_length:
-                        best_match_length = len(history_str)
-                        best_suggestion = Suggestion(suggestion_text)
-
-        return best_suggestion
-
-    def _get_suggestion_text(self, current_text, history_str):
-        if history_str.startswith(current_text):
-            return history_str[len(current_text) :]
-
-        if current_text and not current_text.endswith(" "):
-            current_with_space = current_text + " "
-            if history_str.startswith(current_with_space):
-                return history_str[len(current_with_space) - 1 :]
+        # Every entry extending current_text sits in one contiguous run of
+        # the sorted index.
+        entries = self._hist_sorted
+        keys = self._hist_sorted_keys
+        candidates = []
+        index = bisect.bisect_left(keys, current_text)
+        while index < len(keys) and keys[index].startswith(current_text):
+            history_str, recency = entries[index]
+            candidates.append((-len(history_str), recency, history_str))
+            index += 1
+
+        # Longest wins, the most recent among equals; only validate until
+        # the first one passes. Every candidate already starts with
+        # current_text, so the suggestion is simply the remainder.
+        candidates.sort()
+        prefix_len = len(current_text)
+        for _, _, history_str in candidates:
+            if self._is_suggestion_valid(history_str):
+                return Suggestion(history_str[prefix_len:])
 
         return None
 
+    # Commands whose first argument must exist for a suggestion to be shown.
+    _FILE_COMMANDS = frozenset(
+        {"cd", "ls", "cat", "vim", "nano", "code", "cp", "mv", "rm", "mkdir"}
+    )
+
     def _is_suggestion_valid(self, full_command):
-        parts = full_command.strip().split()
+        parts = full_command.split()
         if not parts:
             return True
 
         command = parts[0].lower()
-        file_commands = {
-            "cd",
-            "ls",
-            "cat",
-            "vim",
-            "nano",
-            "code",
-            "cp",
-            "mv",
-            "rm",
-            "mkdir",
-        }
-
-        if command not in file_commands:
+        if command not in self._FILE_COMMANDS:
             return True
 
         if len(parts) > 1:
@@ -147,22 +275,45 @@ class DirectoryIsolatedHistory(FileHistory):
         self.base_history_dir = Path(base_history_dir).expanduser()
         self.base_history_dir.mkdir(parents=True, exist_ok=True)
         self.current_history_file = None
+        # cwd the current history file was resolved for; resolving and
+        # hashing only happen again after a directory change.
+        self._last_cwd = None
+        # (filename, payload) appends handed to a background writer so disk
+        # latency never holds up the next prompt.
+        self._write_queue = queue.SimpleQueue()
+        self._writer = None
 
         super().__init__(str(self.base_history_dir / ".default_history.txt"))
 
     def _get_directory_hash(self, directory_path):
+        normalized_path = str(Path(directory_path).resolve())
+        return hashlib.blake2b(normalized_path.encode(), digest_size=6).hexdigest()
+
+    def _get_legacy_directory_hash(self, directory_path):
+        # Directory names used before the switch to blake2b.
         normalized_path = str(Path(directory_path).resolve())
         return hashlib.md5(normalized_path.encode()).hexdigest()[:12]
 
     def _get_history_file_for_directory(self, directory_path):
         dir_hash = self._get_directory_hash(directory_path)
         history_dir = self.base_history_dir / dir_hash
+        if not history_dir.exists():
+            legacy_dir = self.base_history_dir / self._get_legacy_directory_hash(
+                directory_path
+            )
+            if legacy_dir.is_dir():
+                try:
+                    legacy_dir.rename(history_dir)
+                except OSError:
+                    pass
         history_dir.mkdir(exist_ok=True)
         return history_dir / "history.txt"
 
     def _ensure_correct_history_file(self):
         try:
             cwd = os.getcwd()
+            if cwd == self._last_cwd:
+                return
             new_history_file = self._get_history_file_for_directory(cwd)
             if self.current_history_file != new_history_file:
                 self.current_history_file = new_history_file
@@ -171,7 +322,9 @@ class DirectoryIsolatedHistory(FileHistory):
                     self._loaded = False
                 if hasattr(self, "_loaded_strings"):
                     self._loaded_strings = []
+            self._last_cwd = cwd
         except Exception:
+            self._last_cwd = None
             if (
                 self.current_history_file
                 != self.base_history_dir / ".default_history.txt"
@@ -190,7 +343,58 @@ class DirectoryIsolatedHistory(FileHistory):
 
     def store_string(self, string):
         self._ensure_correct_history_file()
-        super().store_string(string)
+        # Same record format as FileHistory.store_string.
+        lines = [f"\n# {datetime.datetime.now()}\n"]
+        lines.extend(f"+{line}\n" for line in string.split("\n"))
+        self._write_queue.put((self.filename, "".join(lines).encode("utf-8")))
+        self._start_writer()
+
+    def _start_writer(self):
+        if self._writer is not None:
+            return
+        self._writer = threading.Thread(
+            target=self._write_loop, name="history-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.flush)
+
+    def _write_loop(self):
+        while True:
+            # Block for one entry, then take whatever else is already queued
+            # so a burst of entries costs one open/write per file.
+            batch = [self._write_queue.get()]
+            while batch[-1] is not None and len(batch) < 64:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+
+            pending = {}
+            for filename, payload in batch:
+                pending.setdefault(filename, []).append(payload)
+            for filename, payloads in pending.items():
+                try:
+                    with open(filename, "ab") as f:
+                        f.write(b"".join(payloads))
+                except OSError:
+                    pass
+
+            if stop:
+                return
+
+    def flush(self):
+        """Write out queued entries and stop the writer thread."""
+        writer = self._writer
+        if writer is None:
+            return
+        self._writer = None
+        atexit.unregister(self.flush)
+        self._write_queue.put(None)
+        writer.join(timeout=5)
 
     def get_strings(self):
         self._ensure_correct_history_file()
@@ -224,6 +428,14 @@ class HybridShell:
 
         self._shell_buffer: list[str] = []
         self._shell_awaiting_more: bool = False
+        self._cached_shell_path: Optional[str] = None
+        self._cached_shell_name: Optional[str] = None
+        # Incremental facts about _shell_buffer, maintained by _shell_begin
+        # and _shell_append so _shell_ends_block never rescans the buffer.
+        self._shell_delimiters: Optional[tuple] = _DELIMITERS_CLEAR
+        self._shell_continued: bool = False
+        self._first_line_indent: int = 0
+        self._needs_explicit_end: bool = False
 
         self._setup_keybindings()
 
@@ -232,45 +444,121 @@ class HybridShell:
         self.path_highlight_processor = self._create_path_highlight_processor()
 
     def _create_command_highlight_processor(self):
-        class CommandHighlightProcessor(Processor):
+        class CommandHighlightProcessor(_MemoizedProcessor):
             def __init__(self, highlight_map):
                 self.highlight_map = highlight_map
 
-            def apply_transformation(self, transformation_input):
-                document = transformation_input.document
-                text = document.text
-
-                if not text or not self.highlight_map:
-                    return Transformation(transformation_input.fragments)
-
-                commands_sorted = sorted(
-                    self.highlight_map.items(), key=lambda x: len(x[0]), reverse=True
+                # Longer entries claim text first; a command's rank is its
+                # position in that order and decides overlaps below.
+                ordered = sorted(highlight_map, key=len, reverse=True)
+                self._styles = [highlight_map[command] for command in ordered]
+
+                # One pattern per key, in rank order. A single alternation
+                # would report only one key per position and hide overlapping
+                # keys ("git push" vs "push origin"), so keys are scanned
+                # separately; a substring test skips the ones not in the text.
+                self._patterns = [
+                    (
+                        command,
+                        re.compile(rf"(?:^|\s)({re.escape(command)})(?=\s|$)")
+                        if command.startswith("-")
+                        else re.compile(rf"\b({re.escape(command)})\b"),
+                    )
+                    for command in ordered
+                ]
+
+                # With pyahocorasick installed, one automaton pass finds every
+                # key occurrence; boundaries are then checked like the regexes.
+                self._automaton = None
+                if ahocorasick is not None and ordered and "" not in highlight_map:
+                    automaton = ahocorasick.Automaton()
+                    for rank, command in enumerate(ordered):
+                        automaton.add_word(
+                            command, (rank, len(command), command.startswith("-"))
+                        )
+                    automaton.make_automaton()
+                    self._automaton = automaton
+
+                # Every match starts with one of these characters, so text
+                # without any of them cannot match (an empty key matches
+                # anywhere and disables the shortcut).
+                self._first_chars = (
+                    None
+                    if "" in highlight_map
+                    else frozenset(command[0] for command in highlight_map)
                 )
 
-                matches = []
-                for command, style in commands_sorted:
-                    if command.startswith("-"):
-                        pattern = rf"(?:^|\s)({re.escape(command)})(?=\s|$)"
-                    else:
-                        pattern = rf"\b{re.escape(command)}\b"
+                # Cursor moves and redraws re-render the same text; the last
+                # result answers those without rescanning.
+                self._last_text = None
+                self._last_matches = []
 
-                    for match in re.finditer(pattern, text):
-                        if command.startswith("-"):
+            def _find_matches(self, text):
+                if text == self._last_text:
+                    return self._last_matches
+
+                candidates = []
+                if self._first_chars is not None and self._first_chars.isdisjoint(text):
+                    pass
+                elif self._automaton is not None:
+                    text_len = len(text)
+                    # finditer resumes after each match, so a key's own
+                    # overlapping occurrences are skipped; mirror that here.
+                    resume_at = {}
+                    for last, (command_rank, length, is_flag) in self._automaton.iter(
+                        text
+                    ):
+                        start = last - length + 1
+                        end = last + 1
+                        if is_flag:
+                            if (start and not text[start - 1].isspace()) or (
+                                end < text_len and not text[end].isspace()
+                            ):
+                                continue
+                        elif not (
+                            _is_word_boundary(text, start)
+                            and _is_word_boundary(text, end)
+                        ):
+                            continue
+                        if start < resume_at.get(command_rank, 0):
+                            continue
+                        resume_at[command_rank] = end
+                        candidates.append((command_rank, start, end))
+                else:
+                    for command_rank, (command, pattern) in enumerate(self._patterns):
+                        if command not in text:
+                            continue
+                        for match in pattern.finditer(text):
                             start, end = match.span(1)
-                        else:
-                            start, end = match.span()
+                            candidates.append((command_rank, start, end))
+                candidates.sort()
 
-                        overlap = False
-                        for existing_start, existing_end, existing_style in matches:
-                            if not (end <= existing_start or start >= existing_end):
-                                overlap = True
-                                break
+                # Accepted spans never overlap, so kept sorted their ends rise
+                # too; only the last span starting before `end` can collide.
+                matches = []
+                spans = []
+                for command_rank, start, end in candidates:
+                    index = bisect.bisect_left(spans, (end,))
+                    if index and spans[index - 1][1] > start:
+                        continue
 
-                        if not overlap:
-                            matches.append((start, end, style))
+                    bisect.insort(spans, (start, end))
+                    matches.append((start, end, self._styles[command_rank]))
 
                 matches.sort(key=lambda x: x[0])
 
+                self._last_text = text
+                self._last_matches = matches
+                return matches
+
+            def _transform(self, transformation_input):
+                document = transformation_input.document
+                text = document.text
+
+                if not text or not self.highlight_map:
+                    return Transformation(transformation_input.fragments)
+
+                matches = self._find_matches(text)
                 if not matches:
                     return Transformation(transformation_input.fragments)
 
@@ -316,12 +604,11 @@ class HybridShell:
 
     def _create_path_highlight_processor(self):
 
-        class PathHighlightProcessor(Processor):
-            def __init__(self, shell_instance):
-                self.shell = shell_instance
-                self.file_commands = {
+        class PathHighlightProcessor(_MemoizedProcessor):
+            # Commands whose path arguments must already exist.
+            REQUIRE_EXISTING = frozenset(
+                {
                     "cd",
-                    "pwd",
                     "cat",
                     "head",
                     "tail",
@@ -329,19 +616,14 @@ class HybridShell:
                     "more",
                     "bat",
                     "batcat",
+                    "ls",
                     "rm",
                     "mv",
                     "cp",
                     "ln",
                     "chmod",
-                    "touch",
-                    "ls",
-                    "mkdir",
-                    "rmdir",
-                    "find",
-                    "grep",
-                    "rg",
-                    "ack",
+                    "file",
+                    "stat",
                     "vim",
                     "vi",
                     "nano",
@@ -349,25 +631,33 @@ class HybridShell:
                     "code",
                     "sublime",
                     "subl",
-                    "file",
-                    "stat",
                     "wc",
                     "du",
                     "df",
+                    "find",
                 }
+            )
+            # Commands that create their path arguments.
+            CREATE_NEW = frozenset({"touch", "mkdir"})
+            # Commands where every non-flag argument is a path.
+            ALL_ARGS_ARE_PATHS = frozenset(
+                {
+                    "ls",
+                    "cd",
+                    "mkdir",
+                    "rm",
+                    "cp",
+                    "mv",
+                    "touch",
+                    "rmdir",
+                }
+            )
 
-                self.pattern_commands = {"grep", "rg", "ack", "sed", "awk", "locate"}
-                self.path_cache = {}
-                self.cache_size = 100
-
-            def _get_path_style(self, command, target_arg):
-                from ..config import Config
-
-                if not Config.PATH_HIGHLIGHT.get("enabled", True):
-                    return None
-
-                require_existing = {
+            def __init__(self, shell_instance):
+                self.shell = shell_instance
+                self.file_commands = {
                     "cd",
+                    "pwd",
                     "cat",
                     "head",
                     "tail",
@@ -375,14 +665,19 @@ class HybridShell:
                     "more",
                     "bat",
                     "batcat",
-                    "ls",
                     "rm",
                     "mv",
                     "cp",
                     "ln",
                     "chmod",
-                    "file",
-                    "stat",
+                    "touch",
+                    "ls",
+                    "mkdir",
+                    "rmdir",
+                    "find",
+                    "grep",
+                    "rg",
+                    "ack",
                     "vim",
                     "vi",
                     "nano",
@@ -390,20 +685,40 @@ class HybridShell:
                     "code",
                     "sublime",
                     "subl",
+                    "file",
+                    "stat",
                     "wc",
                     "du",
                     "df",
-                    "find",
                 }
 
-                create_new = {"touch", "mkdir"}
+                self.pattern_commands = {"grep", "rg", "ack", "sed", "awk", "locate"}
+                # st_mode per absolute path (None when missing): one stat()
+                # answers both exists and isdir. Cleared at every prompt so
+                # chdirs and newly created files are picked up.
+                self._path_mode = functools.lru_cache(maxsize=512)(_path_mode)
+
+                # Where relative paths resolve from, picked once: the
+                # executor's own cwd when it tracks one, else the process cwd.
+                executor = getattr(shell_instance, "command_executor", None)
+                if hasattr(executor, "cwd"):
+                    self._get_cwd = lambda: executor.cwd
+                elif hasattr(executor, "get_cwd"):
+                    self._get_cwd = executor.get_cwd
+                else:
+                    self._get_cwd = os.getcwd
+
+            def invalidate(self):
+                self._path_mode.cache_clear()
+                self.reset_memo()
 
-                if command in create_new:
+            def _get_path_style(self, command, target_arg):
+                if command in self.CREATE_NEW:
                     return Config.PATH_HIGHLIGHT.get("create_style", "underline cyan")
 
                 exists = self._check_path_exists(target_arg, command)
 
-                if command in require_existing:
+                if command in self.REQUIRE_EXISTING:
                     if exists:
                         return Config.PATH_HIGHLIGHT.get(
                             "valid_style", "underline cyan"
@@ -416,12 +731,7 @@ class HybridShell:
                 return Config.PATH_HIGHLIGHT.get("valid_style", "underline cyan")
 
             def _check_path_exists(self, path, command=None):
-                cache_key = (path, command)
-                if cache_key in self.path_cache:
-                    return self.path_cache[cache_key]
-
                 if path in {".", ".."}:
-                    self.path_cache[cache_key] = True
                     return True
 
                 if (
@@ -431,64 +741,49 @@ class HybridShell:
                     and not os.path.isabs(path)
                     and len(path) > 1
                 ):
-                    self.path_cache[cache_key] = True
                     return True
 
                 try:
-                    cwd = os.getcwd()
-                    if hasattr(self.shell, "command_executor"):
-                        executor = self.shell.command_executor
-                        if hasattr(executor, "cwd"):
-                            cwd = executor.cwd
-                        elif hasattr(executor, "get_cwd"):
-                            cwd = executor.get_cwd()
-
+                    cwd = self._get_cwd()
                     check_path = path
                     if check_path.startswith("~"):
                         check_path = os.path.expanduser(check_path)
                     elif not os.path.isabs(check_path):
                         check_path = os.path.join(cwd, check_path)
 
+                    mode = self._path_mode(check_path)
+                    if mode is None:
+                        return False
                     if command == "cd":
-                        exists = os.path.isdir(check_path)
-                    else:
-                        exists = os.path.exists(check_path)
-
-                    if len(self.path_cache) >= self.cache_size:
-                        self.path_cache.pop(next(iter(self.path_cache)))
-                    self.path_cache[cache_key] = exists
-
-                    return exists
+                        return stat.S_ISDIR(mode)
+                    return True
                 except Exception:
                     return False
 
-            def apply_transformation(self, transformation_input):
-                document = transformation_input.document
-                text = document.text.strip()
-
-                if not text:
+            def _transform(self, transformation_input):
+                # Disabled highlighting costs one lookup per render.
+                if not Config.PATH_HIGHLIGHT.get("enabled", True):
                     return Transformation(transformation_input.fragments)
 
-                parts = text.split()
-                if not parts:
-                    return Transformation(transformation_input.fragments)
+                document = transformation_input.document
+                text = document.text
 
-                command = parts[0]
-                if command not in self.file_commands:
+                # Most lines start with something other than a file command;
+                # look at the first token alone before tokenizing the rest.
+                first = _TOKEN_RE.search(text)
+                if first is None or first.group() not in self.file_commands:
                     return Transformation(transformation_input.fragments)
+                command = first.group()
 
-                path_args = []  # List of (arg, index) tuples
+                # Tokens and their offsets in one C-level scan; the offsets
+                # place highlights directly, with no searching afterwards.
+                parts = [command]
+                starts = [first.start()]
+                for match in _TOKEN_RE.finditer(text, first.end()):
+                    parts.append(match.group())
+                    starts.append(match.start())
 
-                commands_all_args_are_paths = {
-                    "ls",
-                    "cd",
-                    "mkdir",
-                    "rm",
-                    "cp",
-                    "mv",
-                    "touch",
-                    "rmdir",
-                }
+                path_args = []  # List of (arg, index) tuples
 
                 is_pattern_command = command in self.pattern_commands
                 pattern_found = False
@@ -501,10 +796,10 @@ class HybridShell:
                         i += 1
                         continue
 
-                    if arg in {"|", "&&", "||", ";", ">", "<", ">>", "2>", "&>"}:
+                    if arg in _PIPE_OPS:
                         break
 
-                    if i > 1 and parts[i - 1] in {">", "<", ">>", "2>", "&>"}:
+                    if i > 1 and parts[i - 1] in _REDIR_OPS:
                         i += 1
                         continue
 
@@ -517,14 +812,11 @@ class HybridShell:
                         i += 1
                         continue
 
-                    try:
-                        float(arg)
+                    if _is_float(arg):
                         i += 1
                         continue
-                    except ValueError:
-                        pass
 
-                    if command in commands_all_args_are_paths:
+                    if command in self.ALL_ARGS_ARE_PATHS:
                         path_args.append((arg, i))
                     else:
                         is_likely_path = (
@@ -543,24 +835,18 @@ class HybridShell:
                 if not path_args:
                     return Transformation(transformation_input.fragments)
 
-                full_text = "".join(
-                    fragment_text for _, fragment_text in transformation_input.fragments
-                )
-
-                cmd_pos = full_text.lower().find(command.lower())
-                if cmd_pos == -1:
-                    return Transformation(transformation_input.fragments)
+                # Offsets are into the whole buffer; fragments cover one line.
+                lineno = transformation_input.lineno
+                line_start = document.translate_row_col_to_index(lineno, 0)
+                line_end = line_start + len(document.lines[lineno])
 
                 highlights = []
 
-                search_start = cmd_pos + len(command)
-
                 for target_arg, arg_index in path_args:
-                    position = full_text.lower().find(target_arg.lower(), search_start)
-                    if position == -1:
-                        position = full_text.find(target_arg, search_start)
-                        if position == -1:
-                            continue  # Skip this argument if not found
+                    start = starts[arg_index]
+                    if start < line_start or start >= line_end:
+                        continue
+                    position = start - line_start
 
                     path_style = self._get_path_style(command, target_arg)
                     if path_style is None:
@@ -574,8 +860,6 @@ class HybridShell:
                         }
                     )
 
-                    search_start = position + len(target_arg)
-
                 if not highlights:
                     return Transformation(transformation_input.fragments)
 
@@ -740,6 +1024,10 @@ class HybridShell:
         self.command_executor.set_completion_manager(self.completion_manager)
         self.command_executor.refresh_configuration()
         self.prompt_lexer = self._create_prompt_lexer()
+        # The highlighter compiles its patterns from COMMAND_HIGHLIGHT once,
+        # so it has to be rebuilt to pick up the reloaded table.
+        self.command_highlight_processor = self._create_command_highlight_processor()
+        self.path_highlight_processor.invalidate()
 
         self.console.print(
             PanelTheme.build(
@@ -802,83 +1090,77 @@ class HybridShell:
             self.command_executor.script_runtime.run_line(line)
 
     def _are_delimiters_balanced(self, text: str) -> bool:
-        stack = []
-        in_single_quote = False
-        in_double_quote = False
-        in_backtick = False
-        escape_next = False
-
-        for i, char in enumerate(text):
-            if escape_next:
-                escape_next = False
+        return self._scan_delimiters(text) == _DELIMITERS_CLEAR
+
+    def _scan_delimiters(
+        self, text: str, state: Optional[tuple] = _DELIMITERS_CLEAR
+    ) -> Optional[tuple]:
+        """Advance an (open brackets, open quote) state over ``text``.
+
+        Returns None once a closer does not match, which no later text can
+        repair. Escapes never reach past a newline, so a multi-line buffer can
+        be scanned one line at a time by threading the state through.
+        """
+        if state is None:
+            return None
+
+        opened, quote = state
+        stack = list(opened)
+        # A backslash escapes whatever follows it; only a delimiter there
+        # matters, so remember the index it would sit at.
+        escaped_index = -1
+
+        for match in _DELIMITER_RE.finditer(text):
+            i = match.start()
+            if i == escaped_index:
                 continue
 
+            char = match.group()
             if char == "\\":
-                escape_next = True
+                escaped_index = i + 1
                 continue
 
-            if char == "'" and not in_double_quote and not in_backtick:
-                in_single_quote = not in_single_quote
-                continue
-            if char == '"' and not in_single_quote and not in_backtick:
-                in_double_quote = not in_double_quote
-                continue
-            if char == "`" and not in_single_quote and not in_double_quote:
-                in_backtick = not in_backtick
+            if char in "'\"`":
+                if not quote:
+                    quote = char
+                elif quote == char:
+                    quote = ""
                 continue
 
-            if in_single_quote or in_double_quote or in_backtick:
+            if quote:
                 continue
 
             if char in "{[(":
                 stack.append(char)
             elif char in "}])":
                 if not stack:
-                    return False
-                opening = stack.pop()
-                if (
-                    (opening == "{" and char != "}")
-                    or (opening == "[" and char != "]")
-                    or (opening == "(" and char != ")")
-                ):
-                    return False
-
-        if in_single_quote or in_double_quote or in_backtick:
-            return False
+                    return None
+                if _CLOSING_FOR[stack.pop()] != char:
+                    return None
 
-        return len(stack) == 0
+        return (tuple(stack), quote)
 
     def _get_current_shell(self) -> str:
-        from ..config import Config
-
         shell_path = Config.get_shell()
+        if shell_path == self._cached_shell_path:
+            return self._cached_shell_name
+
         shell_name = os.path.basename(shell_path).lower()
+        shell_type = next(
+            (kind for key, kind in _SHELL_TYPES.items() if key in shell_name),
+            "bash",
+        )
 
-        if "bash" in shell_name:
-            return "bash"
-        elif "zsh" in shell_name:
-            return "zsh"
-        elif "fish" in shell_name:
-            return "fish"
-        elif "nu" in shell_name:
-            return "nushell"
-        elif "xonsh" in shell_name:
-            return "xonsh"
-        else:
-            return "bash"
+        self._cached_shell_path = shell_path
+        self._cached_shell_name = shell_type
+        return shell_type
 
     def _shell_starts_block(self, stripped: str) -> bool:
         if self._are_delimiters_balanced(stripped):
             shell_type = self._get_current_shell()
 
-            if shell_type in ["bash", "zsh"]:
-                if (
-                    stripped.endswith("do")
-                    or stripped.endswith("then")
-                    or stripped.endswith("in")
-                ):
-                    return True
-                if stripped.endswith("\\"):
+            if shell_type in ("bash", "zsh"):
+                if stripped.endswith(_BASH_BLOCK_OPENERS):
                     return True
                 if stripped.startswith("|"):
                     return True
@@ -902,28 +1184,13 @@ class HybridShell:
 
             return False
 
-        return (
-            stripped.endswith("do")
-            or stripped.endswith("then")
-            or stripped.endswith("in")
-            or stripped.endswith("{")
-            or stripped.endswith("\\")
-            or stripped.startswith("|")
-        )
+        return stripped.endswith(_FALLBACK_BLOCK_OPENERS) or stripped.startswith("|")
 
     def _shell_ends_block(self, stripped: str) -> bool:
         shell_type = self._get_current_shell()
 
-        if shell_type in ["bash", "zsh"]:
-            if (
-                stripped == "fi"
-                or stripped == "done"
-                or stripped == "esac"
-                or stripped == "}"
-                or stripped.endswith("; fi")
-                or stripped.endswith("; done")
-                or stripped.endswith("; esac")
-            ):
+        if shell_type in ("bash", "zsh"):
+            if stripped in _BASH_END_TOKENS or stripped.endswith(_BASH_END_SUFFIXES):
                 return True
 
         elif shell_type == "fish":
@@ -938,35 +1205,23 @@ class HybridShell:
             if not stripped:
                 return True
             if self._shell_buffer:
-                first_line = self._shell_buffer[0]
-                first_indent = len(first_line) - len(first_line.lstrip())
                 current_indent = len(stripped) - len(stripped.lstrip())
-                if current_indent < first_indent:
+                if current_indent < self._first_line_indent:
                     return True
 
         if self._shell_buffer:
-            if any(line.rstrip().endswith("\\") for line in self._shell_buffer):
+            if self._shell_continued:
                 if not stripped.endswith("\\") and stripped != "":
                     return True
 
         if self._shell_buffer:
-            all_lines = "\n".join(self._shell_buffer + [stripped])
-            if self._are_delimiters_balanced(all_lines):
-                first_line = self._shell_buffer[0].strip()
-                needs_explicit_end = False
-
-                if shell_type in ["bash", "zsh"]:
-                    if first_line.startswith("for ") or "; do" in first_line:
-                        needs_explicit_end = True
-                    elif first_line.startswith("if ") or "; then" in first_line:
-                        needs_explicit_end = True
-                    elif first_line.startswith("while ") or first_line.startswith(
-                        "until "
-                    ):
-                        needs_explicit_end = True
-                    elif first_line.startswith("case "):
-                        needs_explicit_end = True
-
+            if (
+                self._scan_delimiters(stripped, self._shell_delimiters)
+                == _DELIMITERS_CLEAR
+            ):
+                needs_explicit_end = (
+                    shell_type in ("bash", "zsh") and self._needs_explicit_end
+                )
                 if not needs_explicit_end:
                     return True
 
@@ -976,8 +1231,21 @@ class HybridShell:
         self._shell_awaiting_more = True
         self._shell_buffer = [line]
 
+        first_line = line.strip()
+        self._first_line_indent = len(line) - len(line.lstrip())
+        self._needs_explicit_end = (
+            first_line.startswith(_BASH_EXPLICIT_END_PREFIXES)
+            or "; do" in first_line
+            or "; then" in first_line
+        )
+        self._shell_delimiters = self._scan_delimiters(line)
+        self._shell_continued = line.rstrip().endswith("\\")
+
     def _shell_append(self, line: str) -> None:
         self._shell_buffer.append(line)
+        self._shell_delimiters = self._scan_delimiters(line, self._shell_delimiters)
+        if not self._shell_continued:
+            self._shell_continued = line.rstrip().endswith("\\")
 
     def _shell_flush_execute(self) -> Optional[str]:
         combined = "\n".join(self._shell_buffer)
@@ -1032,6 +1300,7 @@ class HybridShell:
                         ]
 
                     if hasattr(self, "path_highlight_processor"):
+                        self.path_highlight_processor.invalidate()
                         default_processors = prompt_kwargs.get("input_processors", [])
                         if default_processors is None:
                             default_processors = []
@@ -11,35 +11,18 @@ from ..config import Config
 class ConfigurableHighlighter(Highlighter):
     def __init__(self, rules: List[dict]) -> None:
         super().__init__()
-        self._patterns: List[Tuple[re.Pattern[str], str]] = []
-
-        for rule in rules or []:
-            pattern = rule.get("pattern")
-            style = rule.get("style")
-            if not pattern or not style:
-                continue
-
-            style_value = Config.HIGHLIGHTER_STYLES.get(style, style)
-            if not style_value:
-                continue
-
-            flags = re.MULTILINE
-            if rule.get("ignore_case"):
-                flags |= re.IGNORECASE
-
-            try:
-                compiled = re.compile(pattern, flags)
-            except re.error:
-                continue
-
-            self._patterns.append((compiled, style_value))
+        if rules is Config.HIGHLIGHTER_RULES:
+            passes = Config.compiled_highlighter()
+        else:
+            passes = Config.compile_highlighter_rules(rules)
+        self._passes: List[Tuple[re.Pattern[str], str]] = passes
 
     def highlight(self, text) -> None:
-        if not self._patterns:
+        if not self._passes:
             return
 
         plain = text.plain
-        for regex, style in self._patterns:
+        for regex, style in self._passes:
             for match in regex.finditer(plain):
                 start, end = match.span()
                 if start == end:
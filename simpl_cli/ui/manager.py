@@ -818,9 +818,9 @@ class UIManager:
         except (OSError, PermissionError):
             file_type = self._get_file_type_by_extension(filename)
 
-        icon = Config.FILE_ICONS.get(file_type, Config.FILE_ICONS["file"])
-        color_key = "hidden" if is_hidden else file_type
-        color = Config.FILE_COLORS.get(color_key, Config.FILE_COLORS["file"])
+        icon, color = Config.category_style(file_type)
+        if is_hidden:
+            color = Config.category_style("hidden")[1]
         return file_type, icon, color
 
     def _get_file_type_by_extension(self, filename: str) -> str:
@@ -828,7 +828,7 @@ class UIManager:
             return "file"
 
         ext = "." + filename.split(".")[-1].lower() if "." in filename else ""
-        return Config.FILE_EXTENSIONS.get(ext, "file")
+        return Config.ext_lookup(ext)[0]
 
     def _format_size(self, size_bytes) -> str:
         try:
@@ -0,0 +1,23 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Config resolves ~/.simple_cli when simpl_cli is first imported, so HOME has
+# to point at a scratch directory before any test module imports it.
+_SESSION_HOME = tempfile.mkdtemp(prefix="simpl-cli-home-")
+os.environ["HOME"] = _SESSION_HOME
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_SESSION_HOME, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_home(tmp_path_factory, monkeypatch):
+    # Anything that expands ~ at run time lands in a per-test directory, kept
+    # apart from tmp_path so tests can list that freely.
+    home = tmp_path_factory.mktemp("home")
+    monkeypatch.setenv("HOME", str(home))
+    return home
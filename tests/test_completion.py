@@ -0,0 +1,141 @@
+import asyncio
+
+from prompt_toolkit.buffer import Buffer
+from prompt_toolkit.completion import CompleteEvent, Completion
+from prompt_toolkit.document import Document
+
+from simpl_cli.completion import (
+    DynamicPathCompleter,
+    UniversalCompletionRunner,
+    ZshCompletionRunner,
+)
+from simpl_cli.config import Config
+
+
+def _buffer_completions(completer, text):
+    """Run ``completer`` through prompt_toolkit's Buffer, as a Tab press does."""
+    buffer = Buffer(completer=completer)
+    buffer.document = Document(text, len(text))
+    asyncio.run(
+        buffer._async_completer(
+            complete_event=CompleteEvent(completion_requested=True)
+        )
+    )
+    if buffer.complete_state is None:
+        return []
+    return buffer.complete_state.completions
+
+
+def _path_completer():
+    completer = DynamicPathCompleter()
+    completer._ready.wait(10)
+    # Only exercise the built-in directory listing, not the shell runners.
+    completer.universal_completion_runner = None
+    return completer
+
+
+def test_bare_tab_in_large_directory_lists_truncated_entries(tmp_path, monkeypatch):
+    for index in range(30):
+        (tmp_path / f"file{index:02d}.txt").write_text("")
+    for index in range(3):
+        (tmp_path / f"dir{index}").mkdir()
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Config, "COMPLETION_MAX_CANDIDATES", 10)
+
+    completions = _buffer_completions(_path_completer(), "cat ")
+
+    entries, hint = completions[:-1], completions[-1]
+    assert len(entries) == 10
+    assert [completion.text for completion in entries[:3]] == ["dir0", "dir1", "dir2"]
+    assert all(completion.display_meta_text.strip() for completion in entries)
+    assert hint.text == ""
+    assert hint.display_text == "… 33 entries, type to filter"
+
+
+def test_bare_tab_under_the_limit_lists_everything(tmp_path, monkeypatch):
+    for index in range(5):
+        (tmp_path / f"file{index}.txt").write_text("")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Config, "COMPLETION_MAX_CANDIDATES", 10)
+
+    completions = _buffer_completions(_path_completer(), "cat ")
+
+    assert sorted(completion.text for completion in completions) == [
+        f"file{index}.txt" for index in range(5)
+    ]
+
+
+class _RecordingRunner:
+    def __init__(self, texts):
+        self.texts = texts
+        self.calls = []
+
+    def get_completions(self, line, cursor_pos):
+        self.calls.append((line, cursor_pos))
+        return [Completion(text, start_position=-1) for text in self.texts]
+
+
+def _universal_runner(monkeypatch, shell_runner):
+    Config.COMPLETION_MIN_TOKEN_LEN  # finish the lazy load before patching
+    monkeypatch.setattr(Config, "COMPLETION_MIN_TOKEN_LEN", 3)
+    runner = UniversalCompletionRunner()
+    runner._ordered = [shell_runner]
+    return runner
+
+
+def test_short_word_waits_while_typing(monkeypatch):
+    shell_runner = _RecordingRunner(["commit", "checkout"])
+    runner = _universal_runner(monkeypatch, shell_runner)
+
+    assert runner.get_completions("git c", 5, completion_requested=False) == []
+    assert shell_runner.calls == []
+
+
+def test_explicit_tab_completes_short_word(monkeypatch):
+    shell_runner = _RecordingRunner(["commit", "checkout"])
+    runner = _universal_runner(monkeypatch, shell_runner)
+
+    runner.get_completions("git c", 5, completion_requested=False)
+    completions = runner.get_completions("git c", 5, completion_requested=True)
+
+    assert [completion.text for completion in completions] == ["commit", "checkout"]
+    assert shell_runner.calls == [("git c", 5)]
+
+
+def test_same_line_in_another_directory_asks_again(tmp_path, monkeypatch):
+    shell_runner = _RecordingRunner(["commit", "checkout"])
+    runner = _universal_runner(monkeypatch, shell_runner)
+    first = tmp_path / "first"
+    second = tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+
+    monkeypatch.chdir(first)
+    runner.get_completions("git che", 7)
+    monkeypatch.chdir(second)
+    runner.get_completions("git che", 7)
+
+    assert shell_runner.calls == [("git che", 7), ("git che", 7)]
+
+
+def test_zsh_script_is_cached_under_config_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "CACHE_DIR", tmp_path / "cache")
+    runner = ZshCompletionRunner()
+
+    preamble = runner._build_preamble()
+
+    script = tmp_path / "cache" / "complete.zsh"
+    assert script.read_text() == ZshCompletionRunner._COMPLETE_FUNCTION
+    assert f"source {script}" in preamble
+
+
+def test_zsh_script_is_sourced_inline_when_cache_is_unwritable(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setattr(Config, "CACHE_DIR", blocker / "cache")
+    runner = ZshCompletionRunner()
+
+    preamble = runner._build_preamble()
+
+    assert ZshCompletionRunner._COMPLETE_FUNCTION in preamble
+    assert "source" not in preamble
@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _run_python(script, home):
+    # Each run is a fresh interpreter: the lazy load happens once per process.
+    return subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(script)],
+        cwd=REPO_ROOT,
+        env=dict(os.environ, HOME=str(home)),
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_assignment_before_first_read_survives_lazy_load(tmp_path):
+    created = _run_python(
+        """
+        from simpl_cli.config import Config
+
+        assert Config.COMPLETION_MAX_CANDIDATES != 0
+        """,
+        tmp_path,
+    )
+    assert created.returncode == 0, created.stderr
+
+    result = _run_python(
+        """
+        from simpl_cli.config import Config
+
+        Config.COMPLETION_MAX_CANDIDATES = 0
+        assert Config.COMPLETION_MAX_CANDIDATES == 0, Config.COMPLETION_MAX_CANDIDATES
+        """,
+        tmp_path,
+    )
+    assert result.returncode == 0, result.stderr
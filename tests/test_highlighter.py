@@ -0,0 +1,33 @@
+import re
+
+from rich.text import Text
+
+from simpl_cli.config import Config
+from simpl_cli.ui.highlighter import ConfigurableHighlighter
+
+
+def _per_rule_spans(rules, plain):
+    """Spans from applying each rule in its own pass, in order."""
+    spans = []
+    for rule in rules:
+        style = Config.HIGHLIGHTER_STYLES.get(rule["style"], rule["style"])
+        for match in re.finditer(rule["pattern"], plain, re.MULTILINE):
+            if match.start() != match.end():
+                spans.append((match.start(), match.end(), style))
+    return spans
+
+
+def test_overlapping_rules_layer_like_per_rule_passes():
+    rules = list(Config.HIGHLIGHTER_RULES) + [
+        {"pattern": r"(['\"])(\w+)\1", "style": "yellow"},
+    ]
+    plain = "connect \"10.0.0.1\" port 22 as 'admin' from 192.168.1.20"
+    text = Text(plain)
+
+    ConfigurableHighlighter(rules).highlight(text)
+
+    spans = [(span.start, span.end, span.style) for span in text.spans]
+    assert spans == _per_rule_spans(rules, plain)
+    ip_style = Config.HIGHLIGHTER_STYLES["highlight.ip"]
+    assert (9, 17, ip_style) in spans
+    assert (30, 37, "yellow") in spans
@@ -0,0 +1,48 @@
+import itertools
+
+import pytest
+
+from simpl_cli.config import Config
+from simpl_cli.core.hybrid_shell import HybridShell
+
+
+def _command_highlighter(monkeypatch, highlight_map):
+    Config.COMMAND_HIGHLIGHT  # finish the lazy load before patching
+    monkeypatch.setattr(Config, "COMMAND_HIGHLIGHT", highlight_map)
+    shell = HybridShell.__new__(HybridShell)
+    return shell._create_command_highlight_processor()
+
+
+def test_overlapping_highlight_keys_follow_rank(monkeypatch):
+    processor = _command_highlighter(
+        monkeypatch, {"git push": "a", "push origin": "b"}
+    )
+    processor._automaton = None
+
+    assert processor._find_matches("git push origin") == [(4, 15, "b")]
+
+
+def test_regex_and_automaton_paths_agree(monkeypatch):
+    pytest.importorskip("ahocorasick")
+    highlight_map = {
+        "git push": "a",
+        "push origin": "b",
+        "git": "c",
+        "origin": "d",
+        "-a": "e",
+        "--all": "f",
+        "a a": "g",
+        "ls -": "h",
+    }
+    automaton_path = _command_highlighter(monkeypatch, highlight_map)
+    regex_path = _command_highlighter(monkeypatch, highlight_map)
+    regex_path._automaton = None
+    assert automaton_path._automaton is not None
+
+    tokens = ["git", "push", "origin", "-a", "--all", "a", "ls", "-", "x-a"]
+    for length in range(1, 5):
+        for words in itertools.product(tokens, repeat=length):
+            text = " ".join(words)
+            assert automaton_path._find_matches(text) == regex_path._find_matches(
+                text
+            ), text